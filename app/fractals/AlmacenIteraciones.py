@@ -0,0 +1,105 @@
+import json
+import os
+import numpy as np
+from numpy.lib.format import open_memmap
+from fractals.Paletas import colorear, colorear_suave
+
+VERSION = 1
+
+
+class AlmacenIteraciones:
+    """
+    Almacén en disco de las iteraciones de un render de tiempo de escape.
+    Tres archivos con la misma base: <ruta>.npy con los conteos en el dtype más
+    pequeño que admite max_iter, <ruta>_modulo.npy con |z|² en float32 (solo con
+    coloreado suave) y <ruta>.json con los metadatos (tipo, tamaño, límites de la
+    vista, c y max_iter). Los .npy se abren como memmap: el render escribe por
+    teselas sin tener la imagen en RAM, y recolorear, recortar o hacer miniaturas
+    lee vistas sin copias. Cualquier otro proceso puede abrir el mismo almacén.
+    """
+
+    def __init__(self, ruta, metadatos, iteraciones, modulo):
+        self.ruta = ruta
+        self.metadatos = metadatos
+        self.iteraciones = iteraciones
+        self.modulo = modulo
+
+    @classmethod
+    def crear(cls, ruta, tipo, ancho, alto, max_iter, limites, c=None, suave=False):
+        """Crea un almacén vacío; limites = (xmin, xmax, ymin, ymax)"""
+        ruta = _base(ruta)
+        dtype = np.min_scalar_type(max_iter)
+        metadatos = {
+            "version": VERSION,
+            "tipo": tipo,
+            "ancho": ancho,
+            "alto": alto,
+            "max_iter": max_iter,
+            "limites": [float(v) for v in limites],
+            "c": [c.real, c.imag] if c is not None else None,
+            "suave": suave,
+            "dtype": dtype.str,
+        }
+        iteraciones = open_memmap(ruta + ".npy", mode="w+", dtype=dtype, shape=(alto, ancho))
+        modulo = None
+        if suave:
+            modulo = open_memmap(ruta + "_modulo.npy", mode="w+", dtype=np.float32, shape=(alto, ancho))
+        with open(ruta + ".json", "w", encoding="utf-8") as archivo:
+            json.dump(metadatos, archivo, indent=2)
+        return cls(ruta, metadatos, iteraciones, modulo)
+
+    @classmethod
+    def abrir(cls, ruta, modo="r"):
+        """Abre un almacén existente (modo "r" solo lectura, "r+" para completarlo)"""
+        ruta = _base(ruta)
+        with open(ruta + ".json", encoding="utf-8") as archivo:
+            metadatos = json.load(archivo)
+        iteraciones = np.load(ruta + ".npy", mmap_mode=modo)
+        modulo = np.load(ruta + "_modulo.npy", mmap_mode=modo) if metadatos["suave"] else None
+        return cls(ruta, metadatos, iteraciones, modulo)
+
+    @property
+    def max_iter(self):
+        return self.metadatos["max_iter"]
+
+    @property
+    def c(self):
+        c = self.metadatos["c"]
+        return complex(*c) if c is not None else None
+
+    def escribir(self, fila, columna, iteraciones, modulo=None):
+        """Copia una tesela en la posición (fila, columna) de la imagen"""
+        alto, ancho = iteraciones.shape
+        self.iteraciones[fila:fila + alto, columna:columna + ancho] = iteraciones
+        if self.modulo is not None and modulo is not None:
+            self.modulo[fila:fila + alto, columna:columna + ancho] = modulo
+
+    def region(self, f0, f1, c0, c1, paso=1):
+        """Vistas (iteraciones, modulo) de un recorte, opcionalmente submuestreado; sin copias"""
+        recorte = (slice(f0, f1, paso), slice(c0, c1, paso))
+        modulo = self.modulo[recorte] if self.modulo is not None else None
+        return self.iteraciones[recorte], modulo
+
+    def miniatura(self, factor):
+        """Vista submuestreada de todo el almacén (1 de cada factor píxeles)"""
+        return self.region(0, self.metadatos["alto"], 0, self.metadatos["ancho"], factor)
+
+    def colorear(self, paleta, desfase=0, f0=0, f1=None, c0=0, c1=None, paso=1):
+        """RGB de un recorte con cualquier paleta, sin volver a iterar"""
+        iteraciones, modulo = self.region(f0, f1, c0, c1, paso)
+        if modulo is not None:
+            return colorear_suave(iteraciones, modulo, self.max_iter, paleta, desfase)
+        return colorear(iteraciones, self.max_iter, paleta, desfase)
+
+    def cerrar(self):
+        """Vuelca a disco lo escrito y suelta los memmap"""
+        for datos in (self.iteraciones, self.modulo):
+            if isinstance(datos, np.memmap) and datos.mode != "r":
+                datos.flush()
+        self.iteraciones = self.modulo = None
+
+
+def _base(ruta):
+    """Ruta sin la extensión .npy/.json"""
+    raiz, extension = os.path.splitext(ruta)
+    return raiz if extension in (".npy", ".json") else ruta
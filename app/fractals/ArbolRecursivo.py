@@ -1,27 +1,134 @@
 from math import cos, sin, radians
+import numpy as np
+from fractals.Geometria import CacheGeometria, circulo_dentro, circulos_en_vista, transformar
 
 class ArbolRecursivo:
     def __init__(self):
-        pass
+        # Segmentos por (profundidad, factor_angulo, factor_longitud) con tronco de longitud 1
+        self.geometria = CacheGeometria(self.arbol_unitario)
+        # Estilo de dibujo por nivel, interpolado del tronco (nivel 0) a las hojas
+        self.grosor_tronco = 1
+        self.grosor_hojas = 1
+        self.color_tronco = (0, 255, 0)
+        self.color_hojas = (0, 255, 0)
 
-    def ramas(self, x, y, angulo, longitud, profundidad, factor_angulo=30, factor_longitud=0.7):
+    def ramas(self, x, y, angulo, longitud, profundidad, factor_angulo=30, factor_longitud=0.7, longitud_minima=2):
         """
         Genera los segmentos de un árbol fractal recursivo.
         Retorna una lista de tuplas: [(start, end), ...]
         """
-        if profundidad == 0 or longitud < 2:
+        if profundidad == 0 or longitud < longitud_minima:
             return []
         # Calcular el punto final de la rama actual
         x2 = x + longitud * cos(radians(angulo))
         y2 = y - longitud * sin(radians(angulo))
         segmento = [((x, y), (x2, y2))]
         # Recursivamente crear ramas izquierda y derecha
-        segmento += self.ramas(x2, y2, angulo - factor_angulo, longitud * factor_longitud, profundidad - 1, factor_angulo, factor_longitud)
-        segmento += self.ramas(x2, y2, angulo + factor_angulo, longitud * factor_longitud, profundidad - 1, factor_angulo, factor_longitud)
+        segmento += self.ramas(x2, y2, angulo - factor_angulo, longitud * factor_longitud, profundidad - 1, factor_angulo, factor_longitud, longitud_minima)
+        segmento += self.ramas(x2, y2, angulo + factor_angulo, longitud * factor_longitud, profundidad - 1, factor_angulo, factor_longitud, longitud_minima)
         return segmento
 
+    def ramas_por_niveles(self, x, y, angulo, longitud, profundidad, factor_angulo=30, factor_longitud=0.7, longitud_minima=2):
+        """
+        Mismo árbol que ramas, generado en anchura: cada nivel guarda los extremos
+        de todas sus ramas en arrays y los expande a la vez. Las direcciones hijas
+        son la del padre girada ±factor_angulo con un seno y coseno precalculados,
+        sin trigonometría por rama.
+        Retorna un array (N, 2, 2) ordenado por niveles: el nivel k tiene 2^k ramas.
+        """
+        niveles = self.niveles(x, y, angulo, longitud, profundidad, factor_angulo, factor_longitud, longitud_minima)
+        if not niveles:
+            return np.empty((0, 2, 2))
+        return np.concatenate(niveles)
+
+    def niveles(self, x, y, angulo, longitud, profundidad, factor_angulo=30, factor_longitud=0.7,
+                longitud_minima=2, vista=None):
+        """
+        Lista con las ramas (n, 2, 2) de cada nivel, generadas en anchura.
+        Con vista = (x0, y0, x1, y1) se descartan en cada nivel las ramas cuyo
+        subárbol entero queda fuera de la vista, así sus descendientes no se generan.
+        """
+        inicios = np.array([[x, y]], dtype=float)
+        # Dirección en pantalla (la y crece hacia abajo)
+        direcciones = np.array([[cos(radians(angulo)), -sin(radians(angulo))]])
+        c, s = cos(radians(factor_angulo)), sin(radians(factor_angulo))
+        niveles = []
+        for _ in range(profundidad):
+            if longitud < longitud_minima or not len(inicios):
+                break
+            if vista is not None and factor_longitud < 1:
+                # Una rama y todo su subárbol caben en el círculo de radio L / (1 - f)
+                visibles = circulos_en_vista(inicios, np.full(len(inicios), longitud / (1 - factor_longitud)), vista)
+                inicios, direcciones = inicios[visibles], direcciones[visibles]
+            fines = inicios + longitud * direcciones
+            niveles.append(np.stack((inicios, fines), axis=1))
+            # Hijas de cada rama: angulo - factor_angulo y angulo + factor_angulo, juntas
+            dx, dy = direcciones[:, 0], direcciones[:, 1]
+            izquierda = np.stack((dx * c - dy * s, dy * c + dx * s), axis=1)
+            derecha = np.stack((dx * c + dy * s, dy * c - dx * s), axis=1)
+            direcciones = np.stack((izquierda, derecha), axis=1).reshape(-1, 2)
+            inicios = np.repeat(fines, 2, axis=0)
+            longitud *= factor_longitud
+        return niveles
+
     def generar_arbol(self, x, y, angulo, longitud, profundidad):
         """
         Interfaz principal para obtener todos los segmentos del árbol.
+        Retorna un array (N, 2, 2) ordenado por niveles.
         """
-        return self.ramas(x, y, angulo, longitud, profundidad)
+        return self.ramas_por_niveles(x, y, angulo, longitud, profundidad)
+
+    def rangos_niveles(self, segmentos):
+        """Índices [inicio, fin) de cada nivel en un array ordenado por niveles"""
+        rangos = []
+        inicio, n = 0, 1
+        while inicio < len(segmentos):
+            rangos.append((inicio, min(inicio + n, len(segmentos))))
+            inicio += n
+            n *= 2
+        return rangos
+
+    def estilo_nivel(self, nivel, niveles):
+        """(grosor, color) del nivel, interpolando entre tronco y hojas"""
+        t = nivel / (niveles - 1) if niveles > 1 else 0.0
+        grosor = max(1, round(self.grosor_tronco + (self.grosor_hojas - self.grosor_tronco) * t))
+        color = tuple(round(a + (b - a) * t) for a, b in zip(self.color_tronco, self.color_hojas))
+        return grosor, color
+
+    def segmentos(self, x, y, angulo, longitud, profundidad, factor_angulo=30, factor_longitud=0.7):
+        """
+        Segmentos de generar_arbol (ordenados por niveles). El árbol de cada
+        profundidad se genera una vez con tronco de longitud 1 hacia arriba y cada
+        llamada solo lo escala, rota y traslada a (x, y).
+        """
+        # Mismo corte que ramas: los niveles con ramas de menos de 2 píxeles no se dibujan
+        niveles = 0
+        rama = longitud
+        while niveles < profundidad and rama >= 2:
+            niveles += 1
+            rama *= factor_longitud
+        unitario = self.geometria.obtener(niveles, factor_angulo, factor_longitud)
+        # En pantalla la y crece hacia abajo: girar el ángulo del árbol es rotar al revés
+        return transformar(unitario, longitud, -radians(angulo - 90), x, y)
+
+    def segmentos_vista(self, x, y, angulo, longitud, profundidad, vista, factor_angulo=30, factor_longitud=0.7):
+        """
+        Segmentos que se ven en vista = (x0, y0, x1, y1) y sus rangos por nivel.
+        Si el árbol cabe entero en la vista se usa el árbol cacheado de segmentos;
+        si no, se genera en pantalla descartando los subárboles que no la tocan,
+        de modo que con zoom el coste depende de las ramas visibles.
+        Las ramas de menos de 2 píxeles no se dibujan, como en ramas.
+        """
+        if factor_longitud >= 1 or circulo_dentro((x, y), longitud / (1 - factor_longitud), vista):
+            segmentos = self.segmentos(x, y, angulo, longitud, profundidad, factor_angulo, factor_longitud)
+            return segmentos, self.rangos_niveles(segmentos)
+        niveles = self.niveles(x, y, angulo, longitud, profundidad, factor_angulo, factor_longitud, vista=vista)
+        fines = np.cumsum([len(nivel) for nivel in niveles])
+        rangos = list(zip(np.concatenate(([0], fines[:-1])).tolist(), fines.tolist()))
+        if not niveles:
+            return np.empty((0, 2, 2)), rangos
+        return np.concatenate(niveles), rangos
+
+    def arbol_unitario(self, profundidad, factor_angulo, factor_longitud):
+        """Árbol con la base en (0, 0), tronco de longitud 1 hacia arriba y sin corte por longitud"""
+        return self.ramas_por_niveles(0.0, 0.0, 90, 1.0, profundidad, factor_angulo, factor_longitud, longitud_minima=0)
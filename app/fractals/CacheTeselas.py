@@ -0,0 +1,109 @@
+from collections import OrderedDict
+import numpy as np
+
+
+class CacheTeselas:
+    """
+    Cache LRU de teselas de iteraciones compartida por Mandelbrot y Julia.
+    Las vistas están alineadas a una rejilla global de píxeles, así que cada
+    tesela se identifica por (tipo, c, paso de la rejilla, max_iter, tx, ty) y se
+    reutiliza al volver a una vista ya visitada o al alejar el zoom de vuelta.
+    Cada tesela guarda las iteraciones en el dtype más pequeño que admite max_iter,
+    una máscara de píxeles conocidos y, para el coloreado suave, |z|² en float32.
+    Se expulsan las menos usadas recientemente cuando se supera el presupuesto de bytes.
+    """
+
+    def __init__(self, presupuesto_bytes=64 * 1024 * 1024, lado=64):
+        self.presupuesto_bytes = presupuesto_bytes
+        self.lado = lado
+        self.teselas = OrderedDict()
+        self.bytes_usados = 0
+        # Contadores
+        self.aciertos = 0
+        self.fallos = 0
+        self.expulsiones = 0
+
+    def _recorrer(self, origen, forma):
+        """Teselas que cubren la vista con su región en la vista y en la tesela"""
+        gx0, gy0 = origen
+        alto, ancho = forma
+        L = self.lado
+        for ty in range(gy0 // L, (gy0 + alto - 1) // L + 1):
+            y0, y1 = max(ty * L, gy0), min((ty + 1) * L, gy0 + alto)
+            for tx in range(gx0 // L, (gx0 + ancho - 1) // L + 1):
+                x0, x1 = max(tx * L, gx0), min((tx + 1) * L, gx0 + ancho)
+                en_vista = (slice(y0 - gy0, y1 - gy0), slice(x0 - gx0, x1 - gx0))
+                en_tesela = (slice(y0 - ty * L, y1 - ty * L), slice(x0 - tx * L, x1 - tx * L))
+                yield tx, ty, en_vista, en_tesela
+
+    def leer(self, tipo, c, paso, max_iter, origen, iteraciones, conocido, modulo=None):
+        """Copia en la vista los píxeles disponibles en cache y los marca como conocidos"""
+        for tx, ty, en_vista, en_tesela in self._recorrer(origen, iteraciones.shape):
+            clave = (tipo, c, paso, max_iter, modulo is not None, tx, ty)
+            entrada = self.teselas.get(clave)
+            if entrada is None:
+                self.fallos += 1
+                continue
+            self.teselas.move_to_end(clave)
+            self.aciertos += 1
+            valores, ok, modulos = entrada
+            ok = ok[en_tesela]
+            iteraciones[en_vista][ok] = valores[en_tesela][ok]
+            if modulo is not None:
+                modulo[en_vista][ok] = modulos[en_tesela][ok]
+            conocido[en_vista] |= ok
+
+    def guardar(self, tipo, c, paso, max_iter, origen, iteraciones, conocido, modulo=None):
+        """Guarda (o completa) las teselas con los píxeles conocidos de la vista"""
+        dtype = np.min_scalar_type(max_iter)
+        forma = (self.lado, self.lado)
+        for tx, ty, en_vista, en_tesela in self._recorrer(origen, iteraciones.shape):
+            clave = (tipo, c, paso, max_iter, modulo is not None, tx, ty)
+            entrada = self.teselas.get(clave)
+            if entrada is None:
+                entrada = (np.zeros(forma, dtype=dtype), np.zeros(forma, dtype=bool),
+                           np.zeros(forma, dtype=np.float32) if modulo is not None else None)
+                self.teselas[clave] = entrada
+                self.bytes_usados += _bytes(entrada)
+            else:
+                self.teselas.move_to_end(clave)
+            valores, ok, modulos = entrada
+            nuevos = conocido[en_vista]
+            valores[en_tesela][nuevos] = iteraciones[en_vista][nuevos]
+            if modulo is not None:
+                modulos[en_tesela][nuevos] = modulo[en_vista][nuevos]
+            ok[en_tesela] |= nuevos
+
+        # Expulsar las teselas menos usadas recientemente
+        while self.bytes_usados > self.presupuesto_bytes and self.teselas:
+            _, entrada = self.teselas.popitem(last=False)
+            self.bytes_usados -= _bytes(entrada)
+            self.expulsiones += 1
+
+    def contiene(self, tipo, c, paso, max_iter, origen, forma, modulo=False):
+        """True si la vista de tamaño forma (alto, ancho) está completa en cache"""
+        for tx, ty, _, en_tesela in self._recorrer(origen, forma):
+            entrada = self.teselas.get((tipo, c, paso, max_iter, modulo, tx, ty))
+            if entrada is None or not entrada[1][en_tesela].all():
+                return False
+        return True
+
+    def estadisticas(self):
+        """Contadores de uso de la cache"""
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "expulsiones": self.expulsiones,
+            "teselas": len(self.teselas),
+            "bytes": self.bytes_usados,
+        }
+
+    def limpiar(self):
+        """Vacía la cache (los contadores se conservan)"""
+        self.teselas.clear()
+        self.bytes_usados = 0
+
+
+def _bytes(entrada):
+    """Bytes ocupados por una tesela"""
+    return sum(a.nbytes for a in entrada if a is not None)
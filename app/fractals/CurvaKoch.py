@@ -1,9 +1,12 @@
 
-from math import cos, sin, pi
+from math import cos, sin, pi, sqrt
+import numpy as np
+from fractals.Geometria import CacheGeometria, circulo_dentro, circulos_en_vista, transformar
 
 class CurvaKoch:
     def __init__(self):
-        pass
+        # Contorno por profundidad en el marco unitario (triángulo de radio 1 centrado en 0)
+        self.geometria = CacheGeometria(self.contorno_unitario)
 
     def triangulo_equilatero(self, cx, cy, r, angulo_inicial):
         vertices_originales = []
@@ -47,6 +50,119 @@ class CurvaKoch:
                 self.get_koch_curve(p2, p3, depth-1) +
                 self.get_koch_curve(p3, end, depth-1)
             )
-    
-    
 
+    def koch_vectorizado(self, lado, angle, pan_x, pan_y, depth, polilinea=False):
+        """
+        Copo de Koch de copoVonKoch como arrays de NumPy. El contorno de cada
+        profundidad se genera una vez en el marco unitario y cada llamada solo
+        aplica la transformación de la vista (escala, rotación y traslación).
+        Retorna un array (3·4^depth, 2, 2) de segmentos, o con polilinea=True los
+        3·4^depth + 1 vértices del contorno cerrado.
+        """
+        puntos = transformar(self.geometria.obtener(depth), lado, angle, pan_x, pan_y)
+        if polilinea:
+            return puntos
+        return np.stack((puntos[:-1], puntos[1:]), axis=1)
+
+    def contorno_unitario(self, depth):
+        """
+        Contorno cerrado del copo en el marco unitario, generado nivel a nivel:
+        en cada nivel todos los segmentos se reemplazan a la vez por sus cuatro
+        hijos, en el mismo orden que get_koch_curve.
+        """
+        vertices = [(cos(2 * pi * i / 3), sin(2 * pi * i / 3)) for i in range(3)]
+        puntos = np.array(vertices + [vertices[0]], dtype=float)
+        for _ in range(depth):
+            puntos = self.subdividir(puntos)
+        return puntos
+
+    def profundidad_visible(self, lado, depth, tamano_minimo=1.0):
+        """Niveles de depth cuyos segmentos aún miden tamano_minimo píxeles al subdividirse"""
+        segmento = lado * sqrt(3)
+        niveles = 0
+        while niveles < depth and segmento >= tamano_minimo:
+            niveles += 1
+            segmento /= 3
+        return niveles
+
+    def contorno_vista(self, lado, angle, pan_x, pan_y, depth, vista, tamano_minimo=1.0):
+        """
+        Polilíneas del copo que se ven en vista = (x0, y0, x1, y1), con nivel de
+        detalle por tamaño de píxel: un segmento de menos de tamano_minimo píxeles
+        no se subdivide más. Si el copo cabe entero en la vista se usa el contorno
+        cacheado (una sola polilínea); si no, se subdivide en coordenadas de pantalla
+        descartando en cada nivel los segmentos cuya curva no toca la vista, de modo
+        que el coste depende de lo visible y no del zoom ni de depth.
+        """
+        # El copo está dentro del círculo que pasa por los vértices del triángulo
+        if circulo_dentro((pan_x, pan_y), lado, vista):
+            niveles = self.profundidad_visible(lado, depth, tamano_minimo)
+            return [self.koch_vectorizado(lado, angle, pan_x, pan_y, niveles, polilinea=True)]
+
+        puntos = transformar(self.geometria.obtener(0), lado, angle, pan_x, pan_y)
+        segmentos = np.stack((puntos[:-1], puntos[1:]), axis=1)
+        for nivel in range(depth + 1):
+            d = segmentos[:, 1] - segmentos[:, 0]
+            largo = np.hypot(d[:, 0], d[:, 1])
+            # La curva de Koch sobre un segmento cabe en el círculo de diámetro el segmento
+            visibles = circulos_en_vista(segmentos.mean(axis=1), largo / 2, vista)
+            segmentos, largo = segmentos[visibles], largo[visibles]
+            dividir = largo >= tamano_minimo
+            if nivel == depth or not dividir.any():
+                break
+            segmentos = self.subdividir_segmentos(segmentos, dividir)
+        return self.polilineas(segmentos)
+
+    @staticmethod
+    def polilineas(segmentos):
+        """Une los segmentos (N, 2, 2) consecutivos que comparten extremo en polilíneas"""
+        if not len(segmentos):
+            return []
+        cortes = np.flatnonzero(np.any(segmentos[1:, 0] != segmentos[:-1, 1], axis=1)) + 1
+        return [np.concatenate((tramo[:, 0], tramo[-1:, 1]))
+                for tramo in np.split(segmentos, cortes)]
+
+    @staticmethod
+    def intermedios(inicio, fin):
+        """Los tres puntos nuevos (p1, pico, p3) de Koch entre inicio y fin (arrays (N, 2))"""
+        d = fin - inicio
+        p1 = inicio + d / 3
+        p3 = fin - d / 3
+        # Pico: p1-p3 rotado 60° (misma fórmula que get_koch_curve)
+        angle = pi / 3
+        p2 = np.empty_like(p1)
+        p2[:, 0] = (p1[:, 0] + p3[:, 0]) * cos(angle) + (p3[:, 1] - p1[:, 1]) * sin(angle)
+        p2[:, 1] = (p1[:, 1] + p3[:, 1]) * cos(angle) - (p3[:, 0] - p1[:, 0]) * sin(angle)
+        return p1, p2, p3
+
+    @staticmethod
+    def subdividir(puntos):
+        """Un nivel de Koch sobre una polilínea (M+1, 2): retorna la polilínea de 4M+1 vértices"""
+        inicio = puntos[:-1]
+        p1, p2, p3 = CurvaKoch.intermedios(inicio, puntos[1:])
+        nuevos = np.empty((4 * len(inicio) + 1, 2))
+        nuevos[0:-1:4] = inicio
+        nuevos[1::4] = p1
+        nuevos[2::4] = p2
+        nuevos[3::4] = p3
+        nuevos[-1] = puntos[-1]
+        return nuevos
+
+    @staticmethod
+    def subdividir_segmentos(segmentos, dividir):
+        """
+        Un nivel de Koch sobre los segmentos (N, 2, 2) marcados en dividir; el resto
+        se conserva. Los hijos ocupan el lugar del padre, así el orden del contorno
+        (y los extremos compartidos) se mantiene.
+        """
+        cuenta = np.where(dividir, 4, 1)
+        posicion = np.cumsum(cuenta) - cuenta
+        nuevos = np.empty((cuenta.sum(), 2, 2))
+        nuevos[posicion[~dividir]] = segmentos[~dividir]
+
+        inicio, fin = segmentos[dividir, 0], segmentos[dividir, 1]
+        p1, p2, p3 = CurvaKoch.intermedios(inicio, fin)
+        vertices = np.stack((inicio, p1, p2, p3, fin), axis=1)
+        hijos = np.stack((vertices[:, :-1], vertices[:, 1:]), axis=2)
+        nuevos[posicion[dividir][:, None] + np.arange(4)] = hijos
+        return nuevos
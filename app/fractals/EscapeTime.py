@@ -0,0 +1,158 @@
+import numpy as np
+
+# Política de precisión: complex64 solo a zoom bajo, cuando el paso entre píxeles es
+# MARGEN_PRECISION veces el épsilon en la escala del conjunto (|z| <= 2) y con pocas
+# iteraciones (el error de redondeo crece con cada iteración: con 500 en la vista
+# completa de Julia ya difiere un 2.6% de los puntos; con 100, menos del 0.05%)
+MARGEN_PRECISION = 4096
+MAX_ITER_SIMPLE = 100
+
+
+def tipo_iteraciones(max_iter):
+    """dtype entero más pequeño que admite conteos hasta max_iter"""
+    return np.min_scalar_type(max(max_iter, 0))
+
+
+def precision_para(paso, max_iter):
+    """
+    complex64 si el paso entre píxeles lo permite, complex128 si hace falta
+    float64 y None si ni float64 alcanza (zoom profundo por perturbación).
+    Depende solo del paso y de max_iter, así las teselas de cache son coherentes.
+    """
+    if paso >= 2.0 * np.finfo(np.float32).eps * MARGEN_PRECISION and max_iter <= MAX_ITER_SIMPLE:
+        return np.complex64
+    if paso >= 2.0 * np.finfo(np.float64).eps * MARGEN_PRECISION:
+        return np.complex128
+    return None
+
+
+def escape_time(Z, C, max_iter, interior=None, periodicidad=False, tolerancia=1e-20, modulo=False,
+                dtype=complex):
+    """
+    Núcleo de tiempo de escape con conjunto activo compacto.
+    Solo se iteran los puntos que aún no han escapado: en cada iteración se
+    compactan los índices, z y c de los puntos vivos, de modo que el coste
+    depende de los puntos activos y no del tamaño de la imagen.
+    Z y C pueden tener cualquier forma (C también puede ser un escalar).
+    interior: máscara opcional de puntos ya conocidos como interiores (no se iteran).
+    periodicidad: retira las órbitas que vuelven a un punto guardado (ciclo),
+    comprobando contra checkpoints cada vez más espaciados (método de Brent).
+    Retorna las iteraciones con la misma convención que la versión original:
+    última iteración en la que el punto seguía acotado (max_iter - 1 si nunca escapa).
+    modulo: retorna además |z|² (float32) en el momento del escape, 0 si no escapa,
+    para el coloreado suave.
+    dtype: complex128 (referencia) o complex64 (la mitad de ancho de banda, ver precision_para).
+    Las iteraciones se retornan en el dtype entero más pequeño que admite max_iter.
+    """
+    forma = np.shape(Z)
+    z = np.array(Z, dtype=dtype).ravel()
+    c_escalar = np.ndim(C) == 0
+    c = np.dtype(dtype).type(C) if c_escalar else np.broadcast_to(C, forma).ravel().astype(dtype)
+
+    iteraciones = np.full(z.size, max(max_iter - 1, 0), dtype=tipo_iteraciones(max_iter))
+    indices = np.arange(z.size)
+    modulo2 = np.zeros(z.size, dtype=np.float32) if modulo else None
+
+    # Los puntos interiores conocidos conservan max_iter - 1 sin iterar
+    if interior is not None:
+        vivos = ~np.ravel(interior)
+        indices = indices[vivos]
+        z = z[vivos]
+        if not c_escalar:
+            c = c[vivos]
+
+    guardado = z.copy() if periodicidad else None
+    periodo = 8
+    proximo_checkpoint = periodo
+
+    for i in range(max_iter):
+        if indices.size == 0:
+            break
+        # |z|² > 4 evita la raíz cuadrada de np.abs
+        r2 = z.real * z.real + z.imag * z.imag
+        escapados = r2 > 4.0
+        retirar = escapados
+        if escapados.any():
+            iteraciones[indices[escapados]] = max(i - 1, 0)
+            if modulo:
+                modulo2[indices[escapados]] = r2[escapados]
+
+        # Órbitas que repiten un punto ya visitado nunca escaparán
+        if periodicidad and i > 0:
+            d = z - guardado
+            retirar = retirar | (d.real * d.real + d.imag * d.imag < tolerancia)
+
+        if retirar.any():
+            vivos = ~retirar
+            indices = indices[vivos]
+            z = z[vivos]
+            if not c_escalar:
+                c = c[vivos]
+            if periodicidad:
+                guardado = guardado[vivos]
+
+        if periodicidad and i == proximo_checkpoint:
+            guardado = z.copy()
+            periodo *= 2
+            proximo_checkpoint = i + periodo
+
+        z = z * z + c
+
+    if modulo:
+        return iteraciones.reshape(forma), modulo2.reshape(forma)
+    return iteraciones.reshape(forma)
+
+
+def interior_cardioide(x, y):
+    """Puntos dentro de la cardioide principal o del bulbo de periodo 2 (test analítico)"""
+    x = np.asarray(x)
+    y = np.asarray(y)
+    y2 = y * y
+    xc = x - 0.25
+    q = xc * xc + y2
+    cardioide = q * (q + xc) <= 0.25 * y2
+    bulbo = (x + 1.0) * (x + 1.0) + y2 <= 0.0625
+    return cardioide | bulbo
+
+
+def _complejos(x, y, dtype):
+    """x + iy construido directamente en dtype (sin pasar por complex128)"""
+    x, y = np.broadcast_arrays(x, y)
+    z = np.empty(x.shape, dtype=dtype)
+    z.real = x
+    z.imag = y
+    return z
+
+
+def iteraciones_mandelbrot(x, y, max_iter, rechazo_interior=False, periodicidad=False, modulo=False,
+                           dtype=complex):
+    """
+    Iteraciones de Mandelbrot para los puntos c = x + iy (z0 = 0).
+    Con ambas opciones desactivadas es el cálculo por fuerza bruta de referencia.
+    """
+    C = _complejos(x, y, dtype)
+    interior = interior_cardioide(x, y) if rechazo_interior else None
+    return escape_time(np.zeros_like(C), C, max_iter, interior=interior,
+                       periodicidad=periodicidad, modulo=modulo, dtype=dtype)
+
+
+def iteraciones_julia(x, y, c, max_iter, periodicidad=False, modulo=False, dtype=complex):
+    """Iteraciones de Julia para los puntos z0 = x + iy con c constante"""
+    Z = _complejos(x, y, dtype)
+    return escape_time(Z, c, max_iter, periodicidad=periodicidad, modulo=modulo, dtype=dtype)
+
+
+def comparar_precision(x, y, max_iter, c=None, dtype=np.complex64):
+    """
+    Compara el núcleo en dtype con la referencia complex128 sobre los puntos x + iy
+    (Mandelbrot, o Julia si se da c). Retorna (fracción de puntos con distinto
+    conteo, mayor diferencia de iteraciones).
+    """
+    if c is None:
+        rapido = iteraciones_mandelbrot(x, y, max_iter, dtype=dtype)
+        referencia = iteraciones_mandelbrot(x, y, max_iter)
+    else:
+        rapido = iteraciones_julia(x, y, c, max_iter, dtype=dtype)
+        referencia = iteraciones_julia(x, y, c, max_iter)
+    diferencia = np.abs(rapido.astype(np.int64) - referencia.astype(np.int64))
+    return float(np.mean(diferencia > 0)), int(diferencia.max(initial=0))
@@ -0,0 +1,67 @@
+import struct
+import zlib
+import numpy as np
+
+
+class EscritorPNG:
+    """
+    PNG RGB de 8 bits escrito por bandas de filas. Las filas se comprimen a medida
+    que llegan (un solo flujo zlib repartido en varios chunks IDAT), así la imagen
+    completa nunca está en memoria: solo la banda que se está escribiendo.
+    """
+
+    FIRMA = b"\x89PNG\r\n\x1a\n"
+
+    def __init__(self, ruta, ancho, alto, nivel=6):
+        self.ancho = ancho
+        self.alto = alto
+        self.filas = 0
+        self.archivo = open(ruta, "wb")
+        self.compresor = zlib.compressobj(nivel)
+        self.archivo.write(self.FIRMA)
+        # Color RGB (tipo 2), 8 bits, sin entrelazado
+        self._chunk(b"IHDR", struct.pack(">IIBBBBB", ancho, alto, 8, 2, 0, 0, 0))
+
+    def escribir(self, filas):
+        """Añade filas RGB uint8 de forma (n, ancho, 3)"""
+        filas = np.asarray(filas, dtype=np.uint8)
+        n = filas.shape[0]
+        if filas.shape[1:] != (self.ancho, 3):
+            raise ValueError(f"se esperaban filas de forma (n, {self.ancho}, 3), no {filas.shape}")
+        if self.filas + n > self.alto:
+            raise ValueError("más filas que el alto de la imagen")
+        # Cada fila lleva delante su byte de filtro (0 = sin filtro)
+        datos = np.zeros((n, 1 + self.ancho * 3), dtype=np.uint8)
+        datos[:, 1:] = filas.reshape(n, -1)
+        comprimido = self.compresor.compress(datos.tobytes())
+        if comprimido:
+            self._chunk(b"IDAT", comprimido)
+        self.filas += n
+
+    def cerrar(self):
+        """Termina el flujo comprimido y cierra el archivo"""
+        if self.archivo.closed:
+            return
+        try:
+            if self.filas != self.alto:
+                raise ValueError(f"imagen incompleta: {self.filas} de {self.alto} filas")
+            self._chunk(b"IDAT", self.compresor.flush())
+            self._chunk(b"IEND", b"")
+        finally:
+            self.archivo.close()
+
+    def _chunk(self, tipo, datos):
+        """Escribe un chunk PNG: longitud, tipo, datos y CRC"""
+        self.archivo.write(struct.pack(">I", len(datos)))
+        self.archivo.write(tipo)
+        self.archivo.write(datos)
+        self.archivo.write(struct.pack(">I", zlib.crc32(tipo + datos) & 0xFFFFFFFF))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        if tipo is None:
+            self.cerrar()
+        else:
+            self.archivo.close()
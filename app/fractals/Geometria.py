@@ -0,0 +1,61 @@
+from collections import OrderedDict
+from math import cos, sin
+import numpy as np
+
+
+def transformar(puntos, escala, angulo, dx, dy):
+    """
+    Transformación afín de la vista en coordenadas de pantalla (y hacia abajo):
+    escala, rotación de angulo radianes y traslación a (dx, dy).
+    puntos: array (..., 2) en el marco unitario; retorna un array nuevo de la misma forma.
+    """
+    matriz = escala * np.array([[cos(angulo), -sin(angulo)],
+                                [sin(angulo), cos(angulo)]])
+    return puntos @ matriz.T + (dx, dy)
+
+
+def circulos_en_vista(centros, radios, vista, margen=1.0):
+    """
+    Máscara de las piezas cuyo círculo envolvente (centros (N, 2), radios (N,))
+    toca el rectángulo vista = (x0, y0, x1, y1) ampliado en margen píxeles.
+    Lo que una pieza genera al subdividirse queda dentro de su círculo, así que
+    las piezas descartadas no aportan nada a la vista.
+    """
+    x0, y0, x1, y1 = vista
+    dx = centros[:, 0] - np.clip(centros[:, 0], x0, x1)
+    dy = centros[:, 1] - np.clip(centros[:, 1], y0, y1)
+    return dx * dx + dy * dy <= (radios + margen) ** 2
+
+
+def circulo_dentro(centro, radio, vista):
+    """True si el círculo cabe entero en la vista: no hace falta descartar piezas"""
+    x0, y0, x1, y1 = vista
+    return (x0 <= centro[0] - radio and centro[0] + radio <= x1 and
+            y0 <= centro[1] - radio and centro[1] + radio <= y1)
+
+
+class CacheGeometria:
+    """
+    Geometría canónica (marco unitario) por clave, normalmente la profundidad.
+    Se calcula una sola vez y cada frame solo le aplica la transformación de la vista.
+    Guarda las maxsize claves usadas más recientemente.
+    """
+
+    def __init__(self, generar, maxsize=4):
+        # generar(*clave) -> array en el marco unitario
+        self.generar = generar
+        self.maxsize = maxsize
+        self.entradas = OrderedDict()
+
+    def obtener(self, *clave):
+        """Geometría de la clave (de solo lectura), generándola si no está"""
+        puntos = self.entradas.get(clave)
+        if puntos is None:
+            puntos = np.asarray(self.generar(*clave), dtype=float)
+            puntos.flags.writeable = False
+            self.entradas[clave] = puntos
+            while len(self.entradas) > self.maxsize:
+                self.entradas.popitem(last=False)
+        else:
+            self.entradas.move_to_end(clave)
+        return puntos
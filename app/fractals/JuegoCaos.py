@@ -0,0 +1,69 @@
+import numpy as np
+import pygame
+
+# Iteraciones de descarte: tras ellas los puntos ya están a menos de un píxel del atractor
+DESCARTE = 24
+
+
+class JuegoCaos:
+    """
+    Juego del caos del triángulo de Sierpinski: muchos puntos aleatorios que en
+    cada paso se mueven a la mitad del camino hacia un vértice elegido al azar.
+    Los puntos se acumulan por lotes en un buffer de conteo por píxel que se
+    conserva entre frames mientras la vista no cambie, así la imagen se completa
+    en unos pocos frames con coste constante por frame, sea cual sea la profundidad.
+    """
+
+    def __init__(self, ancho, alto, caminantes=65536, pasos_por_frame=8, semilla=None):
+        self.ancho = ancho
+        self.alto = alto
+        self.caminantes = caminantes
+        self.pasos_por_frame = pasos_por_frame
+        # Con este número de puntos por píxel la nube ya no cambia: dejar de iterar
+        self.presupuesto = 4 * ancho * alto
+        self.rng = np.random.default_rng(semilla)
+        self.conteo = np.zeros(alto * ancho, dtype=np.uint32)
+        self.vertices = None
+        self.puntos = None
+        self.acumulados = 0
+        self.superficie = None
+
+    def reiniciar(self, vertices):
+        """Vista nueva: vacía el buffer y coloca los puntos sobre el atractor"""
+        self.vertices = np.array(vertices, dtype=float)
+        self.conteo[:] = 0
+        self.acumulados = 0
+        self.superficie = None
+        # Puntos uniformes dentro del triángulo
+        self.puntos = self.rng.dirichlet((1, 1, 1), self.caminantes) @ self.vertices
+        for _ in range(DESCARTE):
+            self._paso()
+
+    def _paso(self):
+        """Un paso del IFS para todos los puntos a la vez"""
+        elegidos = self.rng.integers(0, 3, self.caminantes)
+        self.puntos += self.vertices[elegidos]
+        self.puntos *= 0.5
+
+    def acumular(self, vertices):
+        """Añade un lote de puntos para los vertices (3, 2) de pantalla y retorna la superficie"""
+        if self.vertices is None or not np.array_equal(vertices, self.vertices):
+            self.reiniciar(vertices)
+        if self.acumulados >= self.presupuesto and self.superficie is not None:
+            return self.superficie
+
+        for _ in range(self.pasos_por_frame):
+            self._paso()
+            x = self.puntos[:, 0].astype(np.intp)
+            y = self.puntos[:, 1].astype(np.intp)
+            dentro = (x >= 0) & (x < self.ancho) & (y >= 0) & (y < self.alto)
+            self.conteo += np.bincount(y[dentro] * self.ancho + x[dentro],
+                                       minlength=self.conteo.size).astype(np.uint32)
+            self.acumulados += self.caminantes
+
+        # Píxeles visitados en blanco, como el contorno de los triángulos
+        colores = np.where(self.conteo > 0, 0xFFFFFF, 0).reshape(self.alto, self.ancho)
+        if self.superficie is None:
+            self.superficie = pygame.Surface((self.ancho, self.alto))
+        pygame.surfarray.blit_array(self.superficie, colores.T)
+        return self.superficie
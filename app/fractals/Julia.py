@@ -1,6 +1,9 @@
 import numpy as np
 import pygame
-from math import cos, sin
+from math import cos, sin, pi
+from fractals.EscapeTime import iteraciones_julia, precision_para, tipo_iteraciones
+from fractals.RenderProgresivo import RenderProgresivo
+from fractals.Paletas import paleta, colorear, colorear_suave
 
 class Julia:
     def __init__(self, width, height, c=complex(-0.7, 0.27015), xmin=-2.0, xmax=2.0, ymin=-2.0, ymax=2.0, max_iter=50):
@@ -12,6 +15,8 @@ class Julia:
         self.ymin = ymin
         self.ymax = ymax
         self.max_iter = max_iter
+        self.range_x = xmax - xmin
+        self.range_y = ymax - ymin
         
         # Cache para optimización
         self.cached_data = None
@@ -23,6 +28,25 @@ class Julia:
         # Superficie para cache de renderizado
         self.surface = None
         
+        # Motor multinúcleo opcional (RenderParalelo); None = un solo núcleo
+        self.render_paralelo = None
+        
+        # Render progresivo: 1/8, 1/4, 1/2 y resolución completa en frames sucesivos
+        self.progresivo = True
+        self.render_progresivo = RenderProgresivo(self.calcular_puntos)
+        
+        # Coloreado: paleta, desfase para ciclar colores y coloreado suave (continuo)
+        self.paleta = "julia"
+        self.desfase_color = 0
+        self.suave = False
+        
+        # Cache de teselas opcional (CacheTeselas), se puede compartir con otros fractales
+        self.cache = None
+        
+        # Precisión del núcleo: "auto" (complex64 a zoom bajo, complex128 al acercarse
+        # al épsilon), "simple" o "doble"
+        self.precision = "auto"
+        
         # Parámetros c predefinidos para variación rápida
         self.c_variations = [
             complex(-0.7, 0.27015),
@@ -35,6 +59,17 @@ class Julia:
             complex(-0.235, -0.827)
         ]
         self.current_c_index = 0
+        # Valores de c por variación: con más de 1 se interpolan valores intermedios
+        # entre variaciones consecutivas al rotar
+        self.pasos_c = 1
+        self.paso_c = 0
+        
+        # Precálculo opcional (PrecalculoJulia) de los c vecinos mientras la vista está quieta
+        self.precalculo = None
+        # Giro por frame de las flechas del visor: el precálculo sigue los mismos pasos
+        # de ángulo para saber desde qué vista (el ángulo gira el centro) se verá cada c
+        self.paso_angulo = pi / 60
+        self.entrada = None  # (scale, angle, pan_x, pan_y) de la última actualización
 
     def julia_vectorized(self):
         """Versión vectorizada usando NumPy"""
@@ -42,30 +77,29 @@ class Julia:
         x = np.linspace(self.xmin, self.xmax, self.effective_width)
         y = np.linspace(self.ymin, self.ymax, self.effective_height)
         X, Y = np.meshgrid(x, y)
+        return self.calcular_puntos(X, Y)
+
+    def calcular_puntos(self, X, Y):
+        """Iteraciones para los puntos X + iY (cualquier forma); con suave también |z|² en el escape"""
+        # Repartir en bandas entre varios núcleos si hay motor paralelo
+        if self.render_paralelo is not None:
+            return self.render_paralelo.calcular("julia", X, Y, self.max_iter, c=self.c, modulo=self.suave,
+                                                 dtype=self.tipo_complejo())
         
-        # Matriz inicial Z
-        Z = X + 1j * Y
-        
-        # Array para iteraciones
-        iterations = np.zeros(Z.shape, dtype=int)
-        
-        # Algoritmo optimizado
-        for i in range(self.max_iter):
-            # Máscara de puntos que no han divergido
-            mask = np.abs(Z) <= 2
-            
-            # Solo calcular puntos activos
-            Z[mask] = Z[mask]**2 + self.c
-            iterations[mask] = i
-            
-            # Salir si todos han divergido
-            if not np.any(mask):
-                break
-        
-        return iterations
+        # Núcleo de conjunto activo: solo itera los puntos que no han divergido
+        return iteraciones_julia(X, Y, self.c, self.max_iter, modulo=self.suave, dtype=self.tipo_complejo())
 
-    def actualizar_parametros(self, scale, angle, pan_x, pan_y, max_iter):
-        """Actualiza parámetros y cambia c dinámicamente"""
+    def tipo_complejo(self):
+        """complex64 o complex128 según la precisión elegida y el paso de la rejilla"""
+        if self.precision == "simple":
+            return np.complex64
+        if self.precision == "doble":
+            return np.complex128
+        _, _, paso, _ = self.rejilla()
+        return precision_para(min(paso), self.max_iter) or np.complex128
+
+    def limites(self, scale, angle, pan_x, pan_y):
+        """Límites (xmin, xmax, ymin, ymax) y rangos de la vista"""
         # Zoom más controlado
         zoom = max(0.1, scale / 150.0)
         
@@ -84,95 +118,202 @@ class Julia:
         # Calcular límites
         range_x = 4.0 / zoom
         range_y = 4.0 / zoom
-        
-        new_xmin = center_x - range_x/2
-        new_xmax = center_x + range_x/2
-        new_ymin = center_y - range_y/2
-        new_ymax = center_y + range_y/2
-        new_max_iter = min(60, max_iter * 10)
-        
+        return (center_x - range_x/2, center_x + range_x/2,
+                center_y - range_y/2, center_y + range_y/2, range_x, range_y)
+
+    def paso_c_en(self, angle):
+        """Paso de c que elige el ángulo"""
         # Cambiar parámetro c basado en el ángulo de forma discreta para mejor rendimiento
         angle_normalized = (angle % (2 * 3.14159)) / (2 * 3.14159)
-        new_c_index = int(angle_normalized * len(self.c_variations))
+        return int(angle_normalized * len(self.c_variations) * self.pasos_c)
+
+    def actualizar_parametros(self, scale, angle, pan_x, pan_y, max_iter):
+        """Actualiza parámetros y cambia c dinámicamente"""
+        self.entrada = (scale, angle, pan_x, pan_y)
+        new_xmin, new_xmax, new_ymin, new_ymax, range_x, range_y = self.limites(scale, angle, pan_x, pan_y)
+        new_max_iter = min(60, max_iter * 10)
         
-        if new_c_index != self.current_c_index:
-            self.current_c_index = new_c_index
-            self.c = self.c_variations[self.current_c_index]
+        new_paso_c = self.paso_c_en(angle)
+        if new_paso_c != self.paso_c:
+            self.paso_c = new_paso_c
+            self.current_c_index = new_paso_c // self.pasos_c
+            self.c = self.c_en(new_paso_c)
         
         # Crear parámetros para comparar cambios
         new_params = (round(new_xmin, 3), round(new_xmax, 3), 
                      round(new_ymin, 3), round(new_ymax, 3), 
-                     new_max_iter, self.current_c_index)
+                     new_max_iter, self.paso_c)
         
         # Solo recalcular si hay cambios significativos
         if self.cached_params != new_params:
             self.xmin, self.xmax = new_xmin, new_xmax
             self.ymin, self.ymax = new_ymin, new_ymax
+            self.range_x, self.range_y = range_x, range_y
             self.max_iter = new_max_iter
             self.cached_params = new_params
             return True
         return False
 
+    def c_en(self, paso_c):
+        """Valor de c del paso paso_c (interpolado entre variaciones si pasos_c > 1)"""
+        total = len(self.c_variations) * self.pasos_c
+        indice, fraccion = divmod(paso_c % total, self.pasos_c)
+        c0 = self.c_variations[indice]
+        if fraccion == 0:
+            return c0
+        c1 = self.c_variations[(indice + 1) % len(self.c_variations)]
+        return c0 + (c1 - c0) * (fraccion / self.pasos_c)
+
+    def vistas_vecinas(self, radio):
+        """
+        (c, xmin, ymin) de los c a los que se llega rotando, del más cercano al más
+        lejano. El ángulo también gira el centro: cada c se da con los límites de la
+        vista desde la que se verá al llegar a él girando de paso_angulo en paso_angulo.
+        """
+        if self.entrada is None:
+            return []
+        scale, angle, pan_x, pan_y = self.entrada
+        total = len(self.c_variations) * self.pasos_c
+        # Pasos de ángulo de una vuelta completa (tope de la búsqueda)
+        vuelta = int(2 * pi / self.paso_angulo) + 1
+        sentidos = []
+        for giro in (self.paso_angulo, -self.paso_angulo):
+            a, anterior, encontrados = angle, self.paso_c, []
+            for _ in range(vuelta):
+                # Sumando como el visor, para obtener exactamente el mismo ángulo
+                a += giro
+                paso_c = self.paso_c_en(a)
+                if paso_c == self.paso_c or len(encontrados) == min(radio, total // 2):
+                    break
+                if paso_c != anterior:
+                    encontrados.append((paso_c, a))
+                    anterior = paso_c
+            sentidos.append(encontrados)
+        vistas, vistos = [], set()
+        for d in range(max(len(s) for s in sentidos)):
+            for encontrados in sentidos:
+                if d < len(encontrados) and encontrados[d][0] not in vistos:
+                    paso_c, a = encontrados[d]
+                    vistos.add(paso_c)
+                    xmin, _, ymin, _, _, _ = self.limites(scale, a, pan_x, pan_y)
+                    vistas.append((self.c_en(paso_c), xmin, ymin))
+        return vistas
+
     def create_color_palette(self):
         """Paleta de colores optimizada para Julia"""
-        colors = np.zeros((self.max_iter + 1, 3), dtype=np.uint8)
-        
-        for i in range(self.max_iter):
-            t = i / self.max_iter
-            
-            # Paleta fría más suave
-            if t < 0.25:
-                ratio = t / 0.25
-                r = int(20 + 80 * ratio)
-                g = int(50 + 150 * ratio)
-                b = int(100 + 155 * ratio)
-            elif t < 0.5:
-                ratio = (t - 0.25) / 0.25
-                r = int(100 + 100 * ratio)
-                g = int(200 + 50 * ratio)
-                b = int(255 - 50 * ratio)
-            elif t < 0.75:
-                ratio = (t - 0.5) / 0.25
-                r = int(200 + 50 * ratio)
-                g = int(250 - 100 * ratio)
-                b = int(205 - 80 * ratio)
-            else:
-                ratio = (t - 0.75) / 0.25
-                r = int(250 + 5 * ratio)
-                g = int(150 + 80 * ratio)
-                b = int(125 + 100 * ratio)
-            
-            colors[i] = [r, g, b]
+        # LUT construida con NumPy y memorizada por (paleta, max_iter, desfase)
+        return paleta(self.paleta, self.max_iter, self.desfase_color)
+
+    def rejilla(self, xmin=None, ymin=None):
+        """
+        Tamaño, paso y origen de la vista en una rejilla global de píxeles
+        (resolución completa si es progresivo). Las coordenadas son múltiplos
+        enteros del paso para que una vista desplazada o revisitada reutilice
+        exactamente las mismas muestras. xmin, ymin: otra vista del mismo zoom.
+        """
+        if self.progresivo:
+            ancho, alto = self.width, self.height
+        else:
+            ancho, alto = self.effective_width, self.effective_height
+        xmin = self.xmin if xmin is None else xmin
+        ymin = self.ymin if ymin is None else ymin
+        paso = (self.range_x / (ancho - 1), self.range_y / (alto - 1))
+        origen = (round(xmin / paso[0]), round(ymin / paso[1]))
+        return ancho, alto, paso, origen
+
+    def coordenadas(self, xmin=None, ymin=None):
+        """Coordenadas de columnas y filas de la vista (o de otra del mismo zoom)"""
+        ancho, alto, paso, origen = self.rejilla(xmin, ymin)
+        xs = (origen[0] + np.arange(ancho)) * paso[0]
+        ys = (origen[1] + np.arange(alto)) * paso[1]
+        return xs, ys
+
+    def guardar_en_cache(self):
+        """Guarda el buffer terminado en la cache de teselas"""
+        if self.cache is not None and self.render_progresivo.completo():
+            _, _, paso, origen = self.rejilla()
+            self.cache.guardar("julia", self.c, paso, self.max_iter, origen,
+                               self.render_progresivo.iteraciones, self.render_progresivo.conocido,
+                               self.render_progresivo.modulo)
+
+    def actualizar_superficie(self):
+        """Colorea las muestras del último nivel y las escala a la ventana"""
+        datos = self.render_progresivo.muestras()
+        small_surface = pygame.Surface((datos.shape[1], datos.shape[0]))
+        
+        # Una sola pasada de LUT sobre el buffer guardado (sin volver a iterar)
+        if self.render_progresivo.suave:
+            color_data = colorear_suave(datos, self.render_progresivo.muestras_modulo(),
+                                        self.max_iter, self.paleta, self.desfase_color)
+        else:
+            color_data = colorear(datos, self.max_iter, self.paleta, self.desfase_color)
+        pygame.surfarray.blit_array(small_surface, color_data.transpose(1, 0, 2))
         
-        # Negro para puntos del conjunto
-        colors[self.max_iter] = [0, 0, 0]
-        return colors
+        if small_surface.get_size() == (self.width, self.height):
+            self.surface = small_surface
+        else:
+            self.surface = pygame.transform.smoothscale(small_surface, (self.width, self.height))
 
-    def dibujar(self, screen, scale, angle, pan_x, pan_y, iter):
-        """Renderizado optimizado"""
-        # Solo recalcular cuando sea necesario
+    def recolorear(self, paleta=None, desfase=None):
+        """Cambia la paleta o el desfase de colores reutilizando las iteraciones guardadas"""
+        if paleta is not None:
+            self.paleta = paleta
+        if desfase is not None:
+            self.desfase_color = desfase % max(self.max_iter, 1)
+        if self.render_progresivo.nivel is not None:
+            self.actualizar_superficie()
+
+    def alternar_suave(self):
+        """Activa/desactiva el coloreado suave; la próxima vista guarda |z|² en el escape"""
+        self.suave = not self.suave
+        self.surface = None
+
+    def preparar(self, scale, angle, pan_x, pan_y, iter):
+        """
+        Actualiza la vista y avanza el render un nivel sin dibujar (se puede llamar
+        desde un hilo de render). Retorna True mientras quede trabajo por hacer.
+        """
+        # Solo recalcular si es necesario
         needs_update = self.actualizar_parametros(scale, angle, pan_x, pan_y, iter)
         
         if needs_update or self.surface is None:
-            # Calcular conjunto de Julia
-            julia_data = self.julia_vectorized()
-            
-            # Crear colores
-            colors = self.create_color_palette()
-            
-            # Superficie pequeña para renderizado rápido
-            small_surface = pygame.Surface((self.effective_width, self.effective_height))
-            
-            # Convertir datos a colores
-            color_data = colors[julia_data]
-            
-            # Renderizado rápido con surfarray
-            pygame.surfarray.blit_array(small_surface, color_data.transpose(1, 0, 2))
-            
-            # Escalar al tamaño completo
-            self.surface = pygame.transform.smoothscale(small_surface, (self.width, self.height))
+            xs, ys = self.coordenadas()
+            if self.surface is not None and self.render_progresivo.desplazar(xs, ys, (self.max_iter, self.c, self.suave)):
+                # Solo se movió el centro: se calcularon únicamente las franjas expuestas
+                self.guardar_en_cache()
+                self.actualizar_superficie()
+            else:
+                # Vista nueva: empezar por el nivel más grueso para responder al instante
+                self.render_progresivo.niveles = (8, 4, 2, 1) if self.progresivo else (1,)
+                self.render_progresivo.suave = self.suave
+                self.render_progresivo.reiniciar(xs, ys, (self.max_iter, self.c, self.suave),
+                                                 tipo_iteraciones(self.max_iter))
+                if self.cache is not None:
+                    # Las teselas ya visitadas no se vuelven a calcular
+                    _, _, paso, origen = self.rejilla()
+                    self.cache.leer("julia", self.c, paso, self.max_iter, origen,
+                                    self.render_progresivo.iteraciones, self.render_progresivo.conocido,
+                                    self.render_progresivo.modulo)
+                self.render_progresivo.refinar()
+                self.guardar_en_cache()
+                self.actualizar_superficie()
+        elif not self.render_progresivo.completo():
+            # Refinar un nivel por frame reutilizando las muestras anteriores
+            self.render_progresivo.refinar()
+            self.guardar_en_cache()
+            self.actualizar_superficie()
+        
+        # Con la vista quieta y terminada, calcular en segundo plano los c vecinos
+        if self.precalculo is not None:
+            self.precalculo.actualizar(self, reposo=not needs_update and self.render_progresivo.completo())
+        
+        return not self.render_progresivo.completo()
+
+    def dibujar(self, screen, scale, angle, pan_x, pan_y, iter):
+        """Renderizado optimizado"""
+        self.preparar(scale, angle, pan_x, pan_y, iter)
         
-        # Dibujar superficie cached
+        # Dibujar la superficie cached
         if self.surface:
             screen.blit(self.surface, (0, 0))
 
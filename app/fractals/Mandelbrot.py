@@ -1,6 +1,11 @@
 import numpy as np
 import pygame
 from math import cos, sin
+from decimal import Decimal, localcontext
+from fractals.EscapeTime import iteraciones_mandelbrot, precision_para, tipo_iteraciones
+from fractals.Perturbacion import orbita_referencia, iteraciones_perturbacion, precision_necesaria, digitos_zoom
+from fractals.RenderProgresivo import RenderProgresivo
+from fractals.Paletas import paleta, colorear, colorear_suave
 
 class Mandelbrot:
     def __init__(self, width, height, xmin=-2.0, xmax=1.0, ymin=-1.5, ymax=1.5, max_iter=50):
@@ -11,6 +16,8 @@ class Mandelbrot:
         self.ymin = ymin
         self.ymax = ymax
         self.max_iter = max_iter
+        self.range_x = xmax - xmin
+        self.range_y = ymax - ymin
         
         # Cache para optimización
         self.cached_data = None
@@ -21,6 +28,38 @@ class Mandelbrot:
         
         # Superficie para cache de renderizado
         self.surface = None
+        
+        # Motor multinúcleo opcional (RenderParalelo); None = un solo núcleo
+        self.render_paralelo = None
+        
+        # Render progresivo: 1/8, 1/4, 1/2 y resolución completa en frames sucesivos
+        self.progresivo = True
+        self.render_progresivo = RenderProgresivo(self.calcular_puntos)
+        
+        # Coloreado: paleta, desfase para ciclar colores y coloreado suave (continuo)
+        self.paleta = "mandelbrot"
+        self.desfase_color = 0
+        self.suave = False
+        
+        # Cache de teselas opcional (CacheTeselas), se puede compartir con otros fractales
+        self.cache = None
+        
+        # Precisión del núcleo: "auto" (complex64 a zoom bajo, complex128 al acercarse
+        # al épsilon y perturbación más allá), "simple" o "doble"
+        self.precision = "auto"
+        
+        # Atajos para el interior del conjunto; desactivarlos da la fuerza bruta
+        # de referencia para comparar resultados bit a bit
+        self.rechazo_interior = True  # cardioide principal y bulbo de periodo 2
+        self.deteccion_periodos = True  # retirar órbitas periódicas
+        
+        # Zoom profundo por perturbación: centro y radio en alta precisión (decimal),
+        # una órbita de referencia y los píxeles como deltas en float64
+        self.zoom_profundo = False
+        self.centro_profundo = (Decimal(0), Decimal(0))
+        self.radio_profundo = Decimal("1.5")
+        self.orbita = None
+        self.entrada_anterior = None
 
     def mandelbrot_vectorized(self):
         """Versión vectorizada usando NumPy para mejor rendimiento"""
@@ -28,31 +67,102 @@ class Mandelbrot:
         x = np.linspace(self.xmin, self.xmax, self.effective_width)
         y = np.linspace(self.ymin, self.ymax, self.effective_height)
         X, Y = np.meshgrid(x, y)
+        return self.calcular_puntos(X, Y)
+
+    def calcular_puntos(self, X, Y):
+        """Iteraciones para los puntos X + iY (cualquier forma); con suave también |z|² en el escape"""
+        # En zoom profundo X + iY son desplazamientos respecto al centro de referencia
+        if self.zoom_profundo:
+            return iteraciones_perturbacion(self.orbita, X + 1j * Y, self.max_iter, modulo=self.suave)
+        
+        # Repartir en bandas entre varios núcleos si hay motor paralelo
+        if self.render_paralelo is not None:
+            return self.render_paralelo.calcular("mandelbrot", X, Y, self.max_iter,
+                                                 rechazo_interior=self.rechazo_interior,
+                                                 periodicidad=self.deteccion_periodos,
+                                                 modulo=self.suave, dtype=self.tipo_complejo())
         
-        # Crear matriz de números complejos
-        C = X + 1j * Y
-        Z = np.zeros_like(C)
+        # Núcleo de conjunto activo: solo itera los puntos que no han divergido
+        return iteraciones_mandelbrot(X, Y, self.max_iter, rechazo_interior=self.rechazo_interior,
+                                      periodicidad=self.deteccion_periodos, modulo=self.suave,
+                                      dtype=self.tipo_complejo())
+
+    def tipo_complejo(self):
+        """complex64 o complex128 según la precisión elegida y el paso de la rejilla"""
+        if self.precision == "simple":
+            return np.complex64
+        if self.precision == "doble":
+            return np.complex128
+        _, _, paso, _ = self.rejilla()
+        return precision_para(min(paso), self.max_iter) or np.complex128
+
+    def activar_zoom_profundo(self, centro_re=None, centro_im=None, radio=None):
+        """
+        Entra en el modo de zoom profundo. El centro y el radio se pueden dar como
+        cadenas con tantos dígitos como haga falta; por defecto parte de la vista actual.
+        """
+        if centro_re is None:
+            centro_re = repr((self.xmin + self.xmax) / 2)
+        if centro_im is None:
+            centro_im = repr((self.ymin + self.ymax) / 2)
+        if radio is None:
+            radio = repr(self.range_x / 2)
+        self.centro_profundo = (Decimal(centro_re), Decimal(centro_im))
+        self.radio_profundo = Decimal(radio)
+        self.zoom_profundo = True
+        self.orbita = None
+        self.entrada_anterior = None
+        self.surface = None
+
+    def desactivar_zoom_profundo(self):
+        """Vuelve al render normal en float64"""
+        self.zoom_profundo = False
+        self.orbita = None
+        self.cached_params = None
+        self.surface = None
+
+    def actualizar_profundo(self, scale, pan_x, pan_y, max_iter):
+        """
+        Parámetros en zoom profundo. Los controles son incrementales: cada paso de
+        escala reduce el radio un 20% y el desplazamiento se mide en píxeles, así
+        el zoom no se detiene en el límite de float64.
+        """
+        entrada = (scale, pan_x, pan_y, max_iter)
+        if entrada == self.entrada_anterior and self.orbita is not None:
+            return False
         
-        # Array para almacenar las iteraciones
-        iterations = np.zeros(C.shape, dtype=int)
+        with localcontext() as ctx:
+            ctx.prec = precision_necesaria(self.radio_profundo)
+            if self.entrada_anterior is not None:
+                escala_ant, pan_x_ant, pan_y_ant, _ = self.entrada_anterior
+                self.radio_profundo *= Decimal(repr(0.8 ** ((scale - escala_ant) / 10.0)))
+                # Dos píxeles de ventana por unidad de desplazamiento
+                paso_x = 2 * self.radio_profundo / self.width
+                paso_y = 2 * self.radio_profundo / self.height
+                centro_re, centro_im = self.centro_profundo
+                self.centro_profundo = (centro_re + paso_x * 2 * (pan_x - pan_x_ant),
+                                        centro_im + paso_y * 2 * (pan_y - pan_y_ant))
+            precision = precision_necesaria(self.radio_profundo)
+        self.entrada_anterior = entrada
         
-        # Algoritmo optimizado con vectorización
-        for i in range(self.max_iter):
-            # Máscara de puntos que no han divergido
-            mask = np.abs(Z) <= 2
-            
-            # Solo calcular puntos que no han divergido
-            Z[mask] = Z[mask]**2 + C[mask]
-            iterations[mask] = i
-            
-            # Si todos los puntos han divergido, salir del bucle
-            if not np.any(mask):
-                break
+        # Más iteraciones cuanto más profundo (sin el límite de 80 del modo normal)
+        self.max_iter = min(20000, 100 * max_iter + int(60 * digitos_zoom(self.radio_profundo)))
+        self.orbita = orbita_referencia(self.centro_profundo[0], self.centro_profundo[1],
+                                        self.max_iter, precision)
         
-        return iterations
+        # Límites aproximados en float64 (solo informativos)
+        radio = float(self.radio_profundo)
+        centro_x, centro_y = float(self.centro_profundo[0]), float(self.centro_profundo[1])
+        self.xmin, self.xmax = centro_x - radio, centro_x + radio
+        self.ymin, self.ymax = centro_y - radio, centro_y + radio
+        self.range_x = self.range_y = 2 * radio
+        return True
 
     def actualizar_parametros(self, scale, angle, pan_x, pan_y, max_iter):
         """Actualiza parámetros solo si han cambiado significativamente"""
+        if self.zoom_profundo:
+            return self.actualizar_profundo(scale, pan_x, pan_y, max_iter)
+        
         # Reducir sensibilidad para evitar recálculos constantes
         zoom = max(0.1, scale / 200.0)  # Mayor factor de zoom para mejor control
         
@@ -86,66 +196,131 @@ class Mandelbrot:
         if self.cached_params != new_params:
             self.xmin, self.xmax = new_xmin, new_xmax
             self.ymin, self.ymax = new_ymin, new_ymax
+            self.range_x, self.range_y = range_x, range_y
             self.max_iter = new_max_iter
             self.cached_params = new_params
+            if self.precision == "auto" and precision_para(min(self.rejilla()[2]), self.max_iter) is None:
+                # Ni float64 alcanza para el paso entre píxeles: seguir por perturbación
+                self.activar_zoom_profundo()
+                return self.actualizar_profundo(scale, pan_x, pan_y, max_iter)
             return True
         return False
 
     def create_color_palette(self):
         """Crear paleta de colores optimizada"""
-        colors = np.zeros((self.max_iter + 1, 3), dtype=np.uint8)
-        
-        for i in range(self.max_iter):
-            # Paleta de colores más suave y rápida
-            t = i / self.max_iter
-            
-            # Gradiente azul-púrpura-naranja
-            if t < 0.33:
-                ratio = t / 0.33
-                r = int(50 * ratio)
-                g = int(100 * ratio)
-                b = int(255 * (1 - ratio * 0.3))
-            elif t < 0.66:
-                ratio = (t - 0.33) / 0.33
-                r = int(50 + 150 * ratio)
-                g = int(100 + 100 * ratio)
-                b = int(200 - 100 * ratio)
-            else:
-                ratio = (t - 0.66) / 0.34
-                r = int(200 + 55 * ratio)
-                g = int(200 - 50 * ratio)
-                b = int(100 * (1 - ratio))
-            
-            colors[i] = [r, g, b]
+        # LUT construida con NumPy y memorizada por (paleta, max_iter, desfase)
+        return paleta(self.paleta, self.max_iter, self.desfase_color)
+
+    def rejilla(self):
+        """
+        Tamaño, paso y origen de la vista en una rejilla global de píxeles
+        (resolución completa si es progresivo). Las coordenadas son múltiplos
+        enteros del paso para que una vista desplazada o revisitada reutilice
+        exactamente las mismas muestras.
+        """
+        if self.progresivo:
+            ancho, alto = self.width, self.height
+        else:
+            ancho, alto = self.effective_width, self.effective_height
+        paso = (self.range_x / (ancho - 1), self.range_y / (alto - 1))
+        origen = (round(self.xmin / paso[0]), round(self.ymin / paso[1]))
+        return ancho, alto, paso, origen
+
+    def coordenadas(self):
+        """Coordenadas de columnas y filas de la vista"""
+        ancho, alto, paso, origen = self.rejilla()
+        if self.zoom_profundo:
+            # Desplazamientos dc respecto al centro de la órbita de referencia
+            xs = (np.arange(ancho) - (ancho - 1) / 2) * paso[0]
+            ys = (np.arange(alto) - (alto - 1) / 2) * paso[1]
+            return xs, ys
+        xs = (origen[0] + np.arange(ancho)) * paso[0]
+        ys = (origen[1] + np.arange(alto)) * paso[1]
+        return xs, ys
+
+    def guardar_en_cache(self):
+        """Guarda el buffer terminado en la cache de teselas"""
+        if self.cache is not None and not self.zoom_profundo and self.render_progresivo.completo():
+            _, _, paso, origen = self.rejilla()
+            self.cache.guardar("mandelbrot", None, paso, self.max_iter, origen,
+                               self.render_progresivo.iteraciones, self.render_progresivo.conocido,
+                               self.render_progresivo.modulo)
+
+    def actualizar_superficie(self):
+        """Colorea las muestras del último nivel y las escala a la ventana"""
+        datos = self.render_progresivo.muestras()
+        small_surface = pygame.Surface((datos.shape[1], datos.shape[0]))
+        
+        # Una sola pasada de LUT sobre el buffer guardado (sin volver a iterar)
+        if self.render_progresivo.suave:
+            color_data = colorear_suave(datos, self.render_progresivo.muestras_modulo(),
+                                        self.max_iter, self.paleta, self.desfase_color)
+        else:
+            color_data = colorear(datos, self.max_iter, self.paleta, self.desfase_color)
+        pygame.surfarray.blit_array(small_surface, color_data.transpose(1, 0, 2))
         
-        # Negro para puntos dentro del conjunto
-        colors[self.max_iter] = [0, 0, 0]
-        return colors
+        if small_surface.get_size() == (self.width, self.height):
+            self.surface = small_surface
+        else:
+            self.surface = pygame.transform.smoothscale(small_surface, (self.width, self.height))
 
-    def dibujar(self, screen, scale, angle, pan_x, pan_y, iter):
-        """Versión optimizada del renderizado"""
+    def recolorear(self, paleta=None, desfase=None):
+        """Cambia la paleta o el desfase de colores reutilizando las iteraciones guardadas"""
+        if paleta is not None:
+            self.paleta = paleta
+        if desfase is not None:
+            self.desfase_color = desfase % max(self.max_iter, 1)
+        if self.render_progresivo.nivel is not None:
+            self.actualizar_superficie()
+
+    def alternar_suave(self):
+        """Activa/desactiva el coloreado suave; la próxima vista guarda |z|² en el escape"""
+        self.suave = not self.suave
+        self.surface = None
+
+    def preparar(self, scale, angle, pan_x, pan_y, iter):
+        """
+        Actualiza la vista y avanza el render un nivel sin dibujar (se puede llamar
+        desde un hilo de render). Retorna True mientras quede trabajo por hacer.
+        """
         # Solo recalcular si es necesario
         needs_update = self.actualizar_parametros(scale, angle, pan_x, pan_y, iter)
         
         if needs_update or self.surface is None:
-            # Calcular conjunto de Mandelbrot
-            mandelbrot_data = self.mandelbrot_vectorized()
-            
-            # Crear paleta de colores
-            colors = self.create_color_palette()
-            
-            # Crear superficie a escala reducida
-            small_surface = pygame.Surface((self.effective_width, self.effective_height))
-            
-            # Convertir datos a imagen usando NumPy (más rápido)
-            color_data = colors[mandelbrot_data]
-            
-            # Usar surfarray para renderizado rápido
-            pygame.surfarray.blit_array(small_surface, color_data.transpose(1, 0, 2))
-            
-            # Escalar la superficie al tamaño completo usando smoothscale para mejor calidad
-            self.surface = pygame.transform.smoothscale(small_surface, (self.width, self.height))
+            xs, ys = self.coordenadas()
+            clave = (self.max_iter, self.suave)
+            if self.zoom_profundo:
+                clave += (self.centro_profundo, self.radio_profundo)
+            if self.surface is not None and self.render_progresivo.desplazar(xs, ys, clave):
+                # Solo se movió el centro: se calcularon únicamente las franjas expuestas
+                self.guardar_en_cache()
+                self.actualizar_superficie()
+            else:
+                # Vista nueva: empezar por el nivel más grueso para responder al instante
+                self.render_progresivo.niveles = (8, 4, 2, 1) if self.progresivo else (1,)
+                self.render_progresivo.suave = self.suave
+                self.render_progresivo.reiniciar(xs, ys, clave, tipo_iteraciones(self.max_iter))
+                if self.cache is not None and not self.zoom_profundo:
+                    # Las teselas ya visitadas no se vuelven a calcular
+                    _, _, paso, origen = self.rejilla()
+                    self.cache.leer("mandelbrot", None, paso, self.max_iter, origen,
+                                    self.render_progresivo.iteraciones, self.render_progresivo.conocido,
+                                    self.render_progresivo.modulo)
+                self.render_progresivo.refinar()
+                self.guardar_en_cache()
+                self.actualizar_superficie()
+        elif not self.render_progresivo.completo():
+            # Refinar un nivel por frame reutilizando las muestras anteriores
+            self.render_progresivo.refinar()
+            self.guardar_en_cache()
+            self.actualizar_superficie()
+        
+        return not self.render_progresivo.completo()
+
+    def dibujar(self, screen, scale, angle, pan_x, pan_y, iter):
+        """Versión optimizada del renderizado"""
+        self.preparar(scale, angle, pan_x, pan_y, iter)
         
         # Dibujar la superficie cached
         if self.surface:
-            screen.blit(self.surface, (0, 0))
\ No newline at end of file
+            screen.blit(self.surface, (0, 0))
@@ -0,0 +1,79 @@
+from functools import lru_cache
+import numpy as np
+
+# Gradientes por tramos: (t_inicio, t_fin, color_inicio, color_fin)
+GRADIENTES = {
+    # Gradiente azul-púrpura-naranja (el de Mandelbrot)
+    "mandelbrot": (
+        (0.0, 0.33, (0, 0, 255), (50, 100, 178.5)),
+        (0.33, 0.66, (50, 100, 200), (200, 200, 100)),
+        (0.66, 1.0, (200, 200, 100), (255, 150, 0)),
+    ),
+    # Paleta fría (la de Julia)
+    "julia": (
+        (0.0, 0.25, (20, 50, 100), (100, 200, 255)),
+        (0.25, 0.5, (100, 200, 255), (200, 250, 205)),
+        (0.5, 0.75, (200, 250, 205), (250, 150, 125)),
+        (0.75, 1.0, (250, 150, 125), (255, 230, 225)),
+    ),
+    "fuego": (
+        (0.0, 0.4, (20, 0, 0), (220, 40, 0)),
+        (0.4, 0.8, (220, 40, 0), (255, 210, 40)),
+        (0.8, 1.0, (255, 210, 40), (255, 255, 230)),
+    ),
+    "grises": (
+        (0.0, 1.0, (15, 15, 15), (245, 245, 245)),
+    ),
+}
+
+NOMBRES = tuple(GRADIENTES)
+
+# Resolución del gradiente continuo para el coloreado suave
+TAMANO_SUAVE = 1024
+
+
+@lru_cache(maxsize=64)
+def gradiente(nombre, tamano):
+    """Gradiente muestreado en t = i / tamano para i en [0, tamano), construido con NumPy"""
+    t = np.arange(tamano) / tamano
+    colores = np.zeros((tamano, 3))
+    for t0, t1, c0, c1 in GRADIENTES[nombre]:
+        tramo = (t >= t0) & ((t < t1) | (t1 >= 1.0))
+        ratio = ((t[tramo] - t0) / (t1 - t0))[:, None]
+        colores[tramo] = np.array(c0) + (np.array(c1) - np.array(c0)) * ratio
+    lut = colores.astype(np.uint8)
+    lut.flags.writeable = False
+    return lut
+
+
+@lru_cache(maxsize=64)
+def paleta(nombre, max_iter, desfase=0):
+    """
+    LUT de max_iter + 1 colores (el último negro) para colorear iteraciones enteras.
+    desfase rota los colores (ciclo de colores) sin tocar las iteraciones.
+    """
+    lut = np.zeros((max_iter + 1, 3), dtype=np.uint8)
+    lut[:max_iter] = np.roll(gradiente(nombre, max_iter), -desfase, axis=0)
+    lut.flags.writeable = False
+    return lut
+
+
+def colorear(iteraciones, max_iter, nombre, desfase=0):
+    """Colores por bandas: una sola pasada de LUT sobre las iteraciones"""
+    return paleta(nombre, max_iter, desfase)[iteraciones]
+
+
+def colorear_suave(iteraciones, modulo, max_iter, nombre, desfase=0):
+    """
+    Coloreado continuo por conteo de iteraciones normalizado a partir de |z|² en el escape:
+    nu = n + 1 - log2(log2|z|). Los puntos que no escaparon (modulo 0) usan el color de la
+    última banda, como en el coloreado por bandas.
+    """
+    escapado = modulo > 4.0
+    nu = iteraciones.astype(np.float32)
+    nu[escapado] += 1.0 - np.log2(0.5 * np.log2(modulo[escapado]))
+    np.clip(nu, 0, max_iter - 1, out=nu)
+    lut = gradiente(nombre, TAMANO_SUAVE)
+    indices = (nu * (TAMANO_SUAVE / max_iter)).astype(np.intp)
+    indices += desfase * TAMANO_SUAVE // max_iter
+    return lut[indices % TAMANO_SUAVE]
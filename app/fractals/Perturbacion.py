@@ -0,0 +1,84 @@
+from decimal import Decimal, localcontext
+import math
+import numpy as np
+from fractals.EscapeTime import tipo_iteraciones
+
+
+def precision_necesaria(radio):
+    """Dígitos decimales para la órbita de referencia según el radio de la vista"""
+    radio = Decimal(radio)
+    digitos = -radio.adjusted() if radio > 0 else 0
+    return max(30, digitos + 20)
+
+
+def orbita_referencia(centro_re, centro_im, max_iter, precision=30):
+    """
+    Órbita de referencia Z_n del centro calculada en alta precisión con decimal.
+    Retorna los Z_n redondeados a complex128 (solo se necesitan con precisión
+    doble para la perturbación). Se detiene al escapar o tras max_iter pasos.
+    """
+    with localcontext() as ctx:
+        ctx.prec = precision
+        cr = Decimal(centro_re)
+        ci = Decimal(centro_im)
+        zr = Decimal(0)
+        zi = Decimal(0)
+        orbita = [0j]
+        for _ in range(max_iter):
+            zr, zi = zr * zr - zi * zi + cr, 2 * zr * zi + ci
+            orbita.append(complex(float(zr), float(zi)))
+            if zr * zr + zi * zi > 4:
+                break
+    return np.array(orbita, dtype=complex)
+
+
+def iteraciones_perturbacion(orbita, dc, max_iter, modulo=False):
+    """
+    Iteraciones de Mandelbrot para c = C_ref + dc evaluando solo deltas en float64:
+    dz_{n+1} = (2 Z_m + dz_n) dz_n + dc, con z_n = Z_m + dz_n.
+    Detección de glitches con rebase: cuando |z_n| < |dz_n| (la delta domina a la
+    referencia y pierde precisión) o se agota la órbita de referencia, se toma
+    dz = z_n y se vuelve al inicio de la órbita (m = 0, Z_0 = 0).
+    Misma convención de iteraciones y de modulo que escape_time.
+    """
+    forma = np.shape(dc)
+    dc = np.array(dc, dtype=complex).ravel()
+    ultimo = len(orbita) - 1
+
+    iteraciones = np.full(dc.size, max(max_iter - 1, 0), dtype=tipo_iteraciones(max_iter))
+    modulo2 = np.zeros(dc.size, dtype=np.float32) if modulo else None
+    indices = np.arange(dc.size)
+    dz = np.zeros_like(dc)
+    m = np.zeros(dc.size, dtype=np.intp)
+
+    for i in range(max_iter):
+        if indices.size == 0:
+            break
+        z = orbita[m] + dz
+        r2 = z.real * z.real + z.imag * z.imag
+        escapados = r2 > 4.0
+        if escapados.any():
+            iteraciones[indices[escapados]] = max(i - 1, 0)
+            if modulo:
+                modulo2[indices[escapados]] = r2[escapados]
+            vivos = ~escapados
+            indices, z, r2, dz, dc, m = indices[vivos], z[vivos], r2[vivos], dz[vivos], dc[vivos], m[vivos]
+
+        # Rebase: continuar desde el inicio de la referencia con la órbita completa como delta
+        rebase = (r2 < dz.real * dz.real + dz.imag * dz.imag) | (m == ultimo)
+        if rebase.any():
+            dz[rebase] = z[rebase]
+            m[rebase] = 0
+
+        dz = (2 * orbita[m] + dz) * dz + dc
+        m += 1
+
+    if modulo:
+        return iteraciones.reshape(forma), modulo2.reshape(forma)
+    return iteraciones.reshape(forma)
+
+
+def digitos_zoom(radio):
+    """Orden de magnitud del zoom (para mostrar y ajustar max_iter)"""
+    radio = Decimal(radio)
+    return max(0.0, -math.log10(float(radio))) if radio.adjusted() > -300 else float(-radio.adjusted())
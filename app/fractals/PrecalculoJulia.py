@@ -0,0 +1,102 @@
+import queue
+import threading
+import numpy as np
+from fractals.EscapeTime import iteraciones_julia
+
+
+class PrecalculoJulia:
+    """
+    Precálculo en segundo plano de los c vecinos de Julia para la vista actual.
+    Mientras la vista está quieta y terminada, un hilo calcula las variaciones de c
+    a las que se llega rotando (las más cercanas primero), cada una en la vista que
+    tendrá al llegar a ella (rotar también gira el centro), y el bucle principal guarda
+    los resultados en la cache de teselas. Al rotar, el cambio de c se resuelve con
+    una lectura de cache y una pasada de LUT en lugar de un cálculo completo.
+    Cuando la vista cambia (zoom, desplazamiento, iteraciones) los trabajos pendientes
+    se descartan. El núcleo de NumPy libera el GIL en las operaciones grandes, así que
+    el hilo no bloquea el bucle de eventos.
+    """
+
+    def __init__(self, cache, vecinos=2):
+        # cache: CacheTeselas compartida con Julia, acotada por su presupuesto de bytes
+        self.cache = cache
+        self.vecinos = vecinos
+        self.trabajos = queue.Queue()
+        self.resultados = queue.Queue()
+        self.generacion = 0  # se incrementa con cada vista nueva
+        self.vista = None
+        self.pedidos = set()  # (c, origen) ya encargados (o guardados) para la vista actual
+        self.calculados = 0
+        self.hilo = threading.Thread(target=self._trabajar, daemon=True)
+        self.hilo.start()
+
+    def actualizar(self, julia, reposo):
+        """
+        Llamar en cada frame: guarda los resultados terminados y, si la vista está
+        quieta (reposo), encarga los c vecinos que aún no están en cache.
+        """
+        ancho, alto, paso, origen = julia.rejilla()
+        vista = (paso, origen, (alto, ancho), julia.max_iter, julia.suave)
+        if vista != self.vista:
+            # Vista nueva: los trabajos pendientes ya no sirven
+            self.generacion += 1
+            self.vista = vista
+            self.pedidos.clear()
+            _vaciar(self.trabajos)
+        self._recoger()
+
+        if not reposo:
+            return
+        for c, xmin, ymin in julia.vistas_vecinas(self.vecinos):
+            _, _, _, origen_c = julia.rejilla(xmin, ymin)
+            if (c, origen_c) in self.pedidos:
+                continue
+            self.pedidos.add((c, origen_c))
+            if self.cache.contiene("julia", c, paso, julia.max_iter, origen_c, (alto, ancho), julia.suave):
+                continue
+            xs, ys = julia.coordenadas(xmin, ymin)
+            self.trabajos.put((self.generacion, c, origen_c, xs, ys, julia.max_iter, julia.suave,
+                               julia.tipo_complejo()))
+
+    def _recoger(self):
+        """Guarda en cache los resultados de la vista actual"""
+        paso, _, forma, max_iter, suave = self.vista
+        while True:
+            try:
+                generacion, c, origen, resultado = self.resultados.get_nowait()
+            except queue.Empty:
+                return
+            if generacion != self.generacion:
+                continue
+            iteraciones, modulo = resultado if suave else (resultado, None)
+            self.cache.guardar("julia", c, paso, max_iter, origen,
+                               iteraciones, np.ones(forma, dtype=bool), modulo)
+            self.calculados += 1
+
+    def _trabajar(self):
+        """Bucle del hilo: calcula la vista completa para cada c encargado"""
+        while True:
+            trabajo = self.trabajos.get()
+            if trabajo is None:
+                return
+            generacion, c, origen, xs, ys, max_iter, suave, dtype = trabajo
+            if generacion != self.generacion:
+                continue
+            X, Y = np.meshgrid(xs, ys)
+            resultado = iteraciones_julia(X, Y, c, max_iter, modulo=suave, dtype=dtype)
+            self.resultados.put((generacion, c, origen, resultado))
+
+    def cerrar(self):
+        """Detiene el hilo (descarta lo pendiente)"""
+        _vaciar(self.trabajos)
+        self.trabajos.put(None)
+        self.hilo.join()
+
+
+def _vaciar(cola):
+    """Descarta los elementos pendientes de una cola"""
+    while True:
+        try:
+            cola.get_nowait()
+        except queue.Empty:
+            return
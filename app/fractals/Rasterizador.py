@@ -0,0 +1,213 @@
+import time
+import numpy as np
+import pygame
+
+# Por encima de estas muestras (píxeles) el bucle en C de pygame gana al muestreo
+# con NumPy: los segmentos más largos se dibujan uno a uno
+MUESTRAS_POR_SEGMENTO = 16
+
+
+def recortar(segmentos, ancho, alto, margen=0):
+    """
+    Recorte de Liang-Barsky para todos los segmentos (N, 2, 2) a la vez contra
+    el rectángulo de píxeles [-margen, ancho - 1 + margen] x [-margen, alto - 1 + margen].
+    Retorna la máscara de los segmentos que lo tocan y el tramo [t0, t1] visible
+    de cada uno (0 en el inicio, 1 en el fin).
+    """
+    inicio = segmentos[:, 0]
+    d = segmentos[:, 1] - inicio
+    t0 = np.zeros(len(segmentos))
+    t1 = np.ones(len(segmentos))
+    for eje, limite in ((0, ancho - 1), (1, alto - 1)):
+        de, pe = d[:, eje], inicio[:, eje]
+        paralelo = de == 0
+        divisor = np.where(paralelo, 1, de)
+        ta = (-0.5 - margen - pe) / divisor
+        tb = (limite + 0.5 + margen - pe) / divisor
+        t0 = np.where(paralelo, t0, np.maximum(t0, np.minimum(ta, tb)))
+        t1 = np.where(paralelo, t1, np.minimum(t1, np.maximum(ta, tb)))
+        # Paralelos al borde y fuera de la franja: descartados
+        fuera = paralelo & ((pe < -0.5 - margen) | (pe > limite + 0.5 + margen))
+        t1 = np.where(fuera, -1.0, t1)
+    visibles = t0 <= t1
+    return visibles, t0, t1
+
+
+def muestras(segmentos, t0, t1):
+    """
+    Muestreo DDA de todos los segmentos a la vez: un punto por píxel del eje mayor,
+    solo en el tramo visible [t0, t1]. Retorna el índice del segmento de cada
+    muestra y su desplazamiento (M, 2) desde el inicio del segmento.
+    """
+    d = segmentos[:, 1] - segmentos[:, 0]
+    pasos = np.ceil(np.abs(d).max(axis=1)).astype(np.intp)
+    primero = np.ceil(t0 * pasos).astype(np.intp)
+    cuenta = np.maximum(np.floor(t1 * pasos).astype(np.intp) - primero + 1, 0)
+    segmento = np.repeat(np.arange(len(segmentos)), cuenta)
+    k = np.arange(cuenta.sum()) - np.repeat(np.cumsum(cuenta) - cuenta, cuenta) + primero[segmento]
+    t = k / np.maximum(pasos, 1)[segmento]
+    return segmento, t[:, None] * d[segmento]
+
+
+def dibujar_segmentos(superficie, segmentos, color, grosor=1, suavizado=False, solo_lotes=False):
+    """
+    Dibuja los segmentos (N, 2, 2) en una sola llamada, escribiendo con NumPy en
+    la vista de píxeles (surfarray) de la superficie en lugar de un pygame.draw.line
+    por segmento. Con grosor > 1 se repite la línea desplazada en el eje menor,
+    como hace pygame. suavizado: antialiasing al estilo de Wu (solo grosor 1).
+    Cada segmento elige camino según su propia longitud; solo_lotes los muestrea
+    todos con NumPy, así un segmento da los mismos píxeles aunque se recorte
+    distinto (pygame.draw.line redondea los extremos recortados).
+    """
+    segmentos = np.asarray(segmentos, dtype=float).reshape(-1, 2, 2)
+    ancho, alto = superficie.get_size()
+    if not len(segmentos):
+        return
+    if superficie.get_bytesize() not in (1, 2, 4) or (suavizado and superficie.get_bytesize() != 4):
+        # Formatos sin vista directa de píxeles
+        _dibujar_uno_a_uno(superficie, segmentos, color, grosor, suavizado)
+        return
+
+    if not suavizado:
+        # Como pygame: los extremos se truncan a píxeles enteros
+        segmentos = np.trunc(segmentos)
+    visibles, t0, t1 = recortar(segmentos, ancho, alto, margen=grosor)
+    segmentos, t0, t1 = segmentos[visibles], t0[visibles], t1[visibles]
+    if not len(segmentos):
+        return
+    d = np.abs(segmentos[:, 1] - segmentos[:, 0])
+    if not solo_lotes:
+        largos = d.max(axis=1) * grosor > MUESTRAS_POR_SEGMENTO
+        if largos.any():
+            _dibujar_uno_a_uno(superficie, segmentos[largos], color, grosor, suavizado)
+            cortos = ~largos
+            segmentos, t0, t1, d = segmentos[cortos], t0[cortos], t1[cortos], d[cortos]
+            if not len(segmentos):
+                return
+    segmento, desplazamiento = muestras(segmentos, t0, t1)
+    vertical = (d[:, 0] < d[:, 1])[segmento]
+    if suavizado and grosor == 1:
+        _mezclar(superficie, segmentos[segmento, 0] + desplazamiento, vertical, color)
+        return
+
+    # Empates hacia el inicio del segmento, como el Bresenham de pygame
+    desplazamiento = np.sign(desplazamiento) * np.ceil(np.abs(desplazamiento) - 0.5)
+    puntos = (segmentos[segmento, 0] + desplazamiento).astype(np.intp)
+    x, y = puntos[:, 0], puntos[:, 1]
+    if grosor > 1:
+        # Desplazamientos en el eje menor de cada segmento
+        desplazamientos = np.arange(grosor) - (grosor - 1) // 2
+        x = (x[:, None] + np.where(vertical[:, None], desplazamientos, 0)).ravel()
+        y = (y[:, None] + np.where(vertical[:, None], 0, desplazamientos)).ravel()
+    dentro = (x >= 0) & (x < ancho) & (y >= 0) & (y < alto)
+    pixeles = pygame.surfarray.pixels2d(superficie)
+    pixeles[x[dentro], y[dentro]] = superficie.map_rgb(color)
+    del pixeles
+
+
+def _dibujar_uno_a_uno(superficie, segmentos, color, grosor, suavizado):
+    """Un pygame.draw.line (o aaline) por segmento"""
+    for inicio, fin in segmentos:
+        if suavizado:
+            pygame.draw.aaline(superficie, color, inicio, fin)
+        else:
+            pygame.draw.line(superficie, color, inicio, fin, grosor)
+
+
+def _mezclar(superficie, puntos, vertical, color):
+    """
+    Antialiasing: cada muestra reparte su cobertura entre los dos píxeles vecinos
+    del eje menor según la distancia; la cobertura de cada píxel es la mayor de
+    sus muestras y el color se mezcla con el fondo en proporción a ella.
+    """
+    ancho, alto = superficie.get_size()
+    mayor = np.floor(np.where(vertical, puntos[:, 1], puntos[:, 0]) + 0.5)
+    menor = np.where(vertical, puntos[:, 0], puntos[:, 1])
+    base = np.floor(menor)
+    fraccion = menor - base
+
+    cobertura = np.zeros(ancho * alto, dtype=np.float32)
+    for desplazamiento, peso in ((0, 1 - fraccion), (1, fraccion)):
+        x = np.where(vertical, base + desplazamiento, mayor).astype(np.intp)
+        y = np.where(vertical, mayor, base + desplazamiento).astype(np.intp)
+        dentro = (x >= 0) & (x < ancho) & (y >= 0) & (y < alto)
+        np.maximum.at(cobertura, x[dentro] * alto + y[dentro], peso[dentro].astype(np.float32))
+
+    tocados = np.flatnonzero(cobertura)
+    alfa = cobertura[tocados, None]
+    x, y = np.divmod(tocados, alto)
+    rgb = pygame.surfarray.pixels3d(superficie)
+    fondo = rgb[x, y].astype(np.float32)
+    rgb[x, y] = (fondo + (np.array(color[:3], dtype=np.float32) - fondo) * alfa + 0.5).astype(np.uint8)
+    del rgb
+
+
+def dibujar_triangulos(superficie, triangulos, color, grosor=1, suavizado=False):
+    """Contorno de los triángulos (N, 3, 2) en una sola llamada a dibujar_segmentos"""
+    triangulos = np.asarray(triangulos, dtype=float)
+    lados = np.stack((triangulos, np.roll(triangulos, -1, axis=1)), axis=2)
+    dibujar_segmentos(superficie, lados.reshape(-1, 2, 2), color, grosor, suavizado)
+
+
+def dibujar_polilineas(superficie, polilineas, color, suavizado=False):
+    """Una llamada de pygame.draw.lines (o aalines) por polilínea (M, 2)"""
+    for puntos in polilineas:
+        if len(puntos) < 2:
+            continue
+        if suavizado:
+            pygame.draw.aalines(superficie, color, False, puntos)
+        else:
+            pygame.draw.lines(superficie, color, False, puntos)
+
+
+def comparar_con_bucle(segmentos, ancho=800, alto=600, grosor=1, repeticiones=5):
+    """
+    Micro-benchmark sobre una superficie (ancho, alto): segundos por dibujo con el
+    bucle de pygame.draw.line, con dibujar_segmentos, con el bucle de
+    pygame.draw.aaline y con dibujar_segmentos suavizado, y la fracción de
+    píxeles en que difieren el bucle y la versión por lotes.
+    """
+    superficies = [pygame.Surface((ancho, alto)) for _ in range(4)]
+
+    def bucle(superficie):
+        _dibujar_uno_a_uno(superficie, segmentos, (255, 255, 255), grosor, False)
+
+    def lotes(superficie):
+        dibujar_segmentos(superficie, segmentos, (255, 255, 255), grosor)
+
+    def bucle_suavizado(superficie):
+        _dibujar_uno_a_uno(superficie, segmentos, (255, 255, 255), grosor, True)
+
+    def suavizado(superficie):
+        dibujar_segmentos(superficie, segmentos, (255, 255, 255), grosor, suavizado=True)
+
+    tiempos = []
+    for funcion, superficie in zip((bucle, lotes, bucle_suavizado, suavizado), superficies):
+        inicio = time.perf_counter()
+        for _ in range(repeticiones):
+            superficie.fill((0, 0, 0))
+            funcion(superficie)
+        tiempos.append((time.perf_counter() - inicio) / repeticiones)
+    a = pygame.surfarray.array2d(superficies[0]) != 0
+    b = pygame.surfarray.array2d(superficies[1]) != 0
+    diferencia = float(np.mean(a != b)) / max(float(np.mean(a | b)), 1e-12)
+    return (*tiempos, diferencia)
+
+
+if __name__ == "__main__":
+    # python -m fractals.Rasterizador desde app/: bucle por segmento contra lotes
+    from fractals.CurvaKoch import CurvaKoch
+    from fractals.Sierpinski import Sierpinski
+    from fractals.ArbolRecursivo import ArbolRecursivo
+
+    triangulos = Sierpinski().triangulos(280, 0, 400, 330, 7)
+    casos = [
+        ("koch 7", CurvaKoch().koch_vectorizado(250, 0, 400, 300, 7)),
+        ("sierpinski 7", np.stack((triangulos, np.roll(triangulos, -1, axis=1)), axis=2).reshape(-1, 2, 2)),
+        ("arbol 14", ArbolRecursivo().segmentos(400, 580, 90, 160, 14)),
+    ]
+    print(f"{'caso':<14}{'segmentos':>10}{'line ms':>10}{'lotes ms':>10}{'aaline ms':>11}{'suave ms':>10}{'dif %':>8}")
+    for nombre, segmentos in casos:
+        bucle, lotes, bucle_suave, suave, diferencia = comparar_con_bucle(segmentos)
+        print(f"{nombre:<14}{len(segmentos):>10}{bucle * 1000:>10.1f}{lotes * 1000:>10.1f}"
+              f"{bucle_suave * 1000:>11.1f}{suave * 1000:>10.1f}{diferencia * 100:>8.2f}")
@@ -0,0 +1,140 @@
+import threading
+
+
+class RenderAsincrono:
+    """
+    Planificador de render en un hilo aparte para Mandelbrot y Julia.
+    El bucle de pygame encarga la vista con solicitar() y dibuja siempre la última
+    superficie terminada, así la entrada y el HUD no esperan al cálculo. Solo se
+    guarda el pedido más reciente: uno nuevo deja obsoleto al que se está calculando,
+    que se abandona en el siguiente punto de corte (entre niveles del render
+    progresivo).
+    Todo lo que modifica un fractal (recolorear, coloreado suave, zoom profundo)
+    se pasa con ejecutar() para que corra en el mismo hilo que el render.
+    """
+
+    def __init__(self, espera_reposo=0.1):
+        # Con la vista terminada se vuelve a preparar cada espera_reposo segundos
+        # (lo usa por ejemplo el precálculo de Julia)
+        self.espera_reposo = espera_reposo
+        self.condicion = threading.Condition()
+        self.pedido = None  # (fractal, parámetros) más reciente sin atender
+        self.ultimo = None  # último pedido recibido, para ignorar repetidos
+        self.comandos = []
+        self.superficies = {}
+        # Se incrementa cada vez que cambia la superficie de un fractal: quien la
+        # muestra solo necesita volver a componer cuando cambia la versión
+        self.versiones = {}
+        self.pendiente = False  # al pedido actual le quedan niveles por calcular
+        # El hilo está calculando un pedido o un comando cuyo resultado aún no publicó
+        self.trabajando = False
+        # salir() la incrementa: el trabajo tomado con otra generación ya no se publica
+        self.generacion = 0
+        self.tomado = 0  # generación del pedido que tiene el hilo
+        self.activo = True
+        # Contadores
+        self.pedidos = 0
+        self.cancelados = 0
+        self.hilo = threading.Thread(target=self._trabajar, daemon=True)
+        self.hilo.start()
+
+    def solicitar(self, fractal, scale, angle, pan_x, pan_y, iter):
+        """Encarga la vista (no bloquea); los pedidos iguales al anterior se ignoran"""
+        pedido = (fractal, (scale, angle, pan_x, pan_y, iter))
+        with self.condicion:
+            if pedido == self.ultimo:
+                return
+            self.ultimo = pedido
+            self.pedido = pedido
+            self.pedidos += 1
+            self.condicion.notify()
+
+    def ejecutar(self, funcion, *args, **kwargs):
+        """Ejecuta funcion(*args, **kwargs) en el hilo de render antes del siguiente paso"""
+        with self.condicion:
+            self.comandos.append((funcion, args, kwargs))
+            self.condicion.notify()
+
+    def superficie(self, fractal):
+        """Última superficie terminada de fractal (o None si aún no hay ninguna)"""
+        return self.superficies.get(fractal)
+
+    def descartar(self, fractal):
+        """
+        Olvida la superficie de fractal y el último pedido (al volver a una escena
+        con otra vista): el siguiente pedido se prepara aunque repita la vista
+        anterior, normalmente desde la cache de teselas
+        """
+        with self.condicion:
+            self.superficies.pop(fractal, None)
+            self.ultimo = None
+
+    def salir(self):
+        """
+        Cancela y olvida el pedido actual (al salir de la escena): el hilo deja de
+        repasar la vista en reposo y un nivel a medias no llega a publicarse
+        """
+        with self.condicion:
+            self.pedido = None
+            self.ultimo = None
+            self.generacion += 1
+            self.condicion.notify()
+
+    def version(self, fractal):
+        """Número de actualizaciones de la superficie de fractal"""
+        return self.versiones.get(fractal, 0)
+
+    def ocupado(self):
+        """True mientras queden pedidos, comandos o niveles por calcular o publicar"""
+        return self.pedido is not None or bool(self.comandos) or self.pendiente or self.trabajando
+
+    def _trabajar(self):
+        """Bucle del hilo: atiende comandos y avanza el pedido actual nivel a nivel"""
+        actual = None
+        while True:
+            with self.condicion:
+                while (self.activo and self.pedido is None and not self.comandos and not self.pendiente
+                       and self.generacion == self.tomado):
+                    if not self.condicion.wait(self.espera_reposo if actual is not None else None):
+                        break  # vista quieta: repasar en reposo
+                if not self.activo:
+                    return
+                if self.generacion != self.tomado:
+                    # salir(): soltar el pedido en curso y sus niveles pendientes
+                    if self.pendiente:
+                        self.cancelados += 1
+                    actual = None
+                    self.pendiente = False
+                    self.tomado = self.generacion
+                comandos, self.comandos = self.comandos, []
+                # En reposo (sin pedido nuevo ni niveles pendientes) la superficie no cambia
+                cambia = bool(comandos) or self.pedido is not None or self.pendiente
+                if self.pedido is not None:
+                    if self.pendiente:
+                        self.cancelados += 1
+                    actual, self.pedido = self.pedido, None
+                # Ocupado desde que se toma el trabajo hasta que se publica su resultado
+                self.trabajando = cambia
+
+            for funcion, args, kwargs in comandos:
+                funcion(*args, **kwargs)
+            if actual is None:
+                self.trabajando = False
+                continue
+
+            fractal, parametros = actual
+            pendiente = fractal.preparar(*parametros)
+            with self.condicion:
+                if self.generacion == self.tomado:
+                    self.pendiente = pendiente
+                    if fractal.surface is not None and cambia:
+                        self.superficies[fractal] = fractal.surface
+                        self.versiones[fractal] = self.version(fractal) + 1
+                self.trabajando = False
+
+    def cerrar(self):
+        """Detiene el hilo de render"""
+        with self.condicion:
+            self.activo = False
+            self.condicion.notify()
+        self.hilo.join()
@@ -0,0 +1,136 @@
+import multiprocessing as mp
+from multiprocessing import resource_tracker, shared_memory
+import os
+import numpy as np
+from fractals.EscapeTime import iteraciones_mandelbrot, iteraciones_julia
+
+# Memoria compartida abierta por cada proceso trabajador (se reutiliza entre tareas)
+_memoria_trabajador = {}
+
+
+def _adjuntar(nombre):
+    """Abre (una sola vez por proceso) el bloque de memoria compartida"""
+    shm = _memoria_trabajador.get(nombre)
+    if shm is None:
+        for anterior in _memoria_trabajador.values():
+            anterior.close()
+        _memoria_trabajador.clear()
+        try:
+            shm = shared_memory.SharedMemory(name=nombre, track=False)
+        except TypeError:
+            # Python < 3.13: el trabajador no es dueño del bloque, no registrarlo.
+            # Con forkserver o spawn el resource_tracker es el del proceso principal
+            # y quitar el registro después le borraría el suyo
+            registrar = resource_tracker.register
+            resource_tracker.register = lambda *args: None
+            try:
+                shm = shared_memory.SharedMemory(name=nombre)
+            finally:
+                resource_tracker.register = registrar
+        _memoria_trabajador[nombre] = shm
+    return shm
+
+
+def _vistas(buf, n):
+    """Vistas x, y, salida y módulo sobre el bloque compartido, sin copias"""
+    x = np.ndarray((n,), dtype=np.float64, buffer=buf, offset=0)
+    y = np.ndarray((n,), dtype=np.float64, buffer=buf, offset=8 * n)
+    salida = np.ndarray((n,), dtype=np.uint32, buffer=buf, offset=16 * n)
+    modulo = np.ndarray((n,), dtype=np.float32, buffer=buf, offset=20 * n)
+    return x, y, salida, modulo
+
+
+def _calcular_banda(tarea):
+    """Calcula una banda de puntos y la escribe directamente en la memoria compartida"""
+    nombre, n, inicio, fin, tipo, c, max_iter, opciones = tarea
+    shm = _adjuntar(nombre)
+    x, y, salida, modulo = _vistas(shm.buf, n)
+    if tipo == "mandelbrot":
+        resultado = iteraciones_mandelbrot(x[inicio:fin], y[inicio:fin], max_iter, **opciones)
+    else:
+        resultado = iteraciones_julia(x[inicio:fin], y[inicio:fin], c, max_iter, **opciones)
+    if opciones.get("modulo"):
+        salida[inicio:fin], modulo[inicio:fin] = resultado
+    else:
+        salida[inicio:fin] = resultado
+    del x, y, salida, modulo
+    return fin - inicio
+
+
+class RenderParalelo:
+    """
+    Motor de render por bandas para Mandelbrot y Julia en varios núcleos.
+    Los puntos se dividen en bandas pequeñas (filas contiguas de la malla) que
+    un Pool reparte dinámicamente, así las bandas caras del interior del
+    conjunto no dejan núcleos ociosos. Entrada y salida viven en un bloque de
+    memoria compartida: los trabajadores escriben las iteraciones sin copias.
+    """
+
+    def __init__(self, procesos=None, puntos_por_tarea=8192):
+        self.procesos = procesos or os.cpu_count() or 1
+        self.puntos_por_tarea = puntos_por_tarea
+        self.pool = None
+        self.shm = None
+        self.capacidad = 0
+
+    def _preparar(self, n):
+        """Crea el pool y (re)dimensiona el bloque compartido si hace falta"""
+        if self.pool is None:
+            # Se crea desde el hilo de render, con otros hilos vivos: fork() copiaría
+            # sus cerrojos tomados. forkserver o spawn arrancan procesos limpios
+            metodo = "forkserver" if "forkserver" in mp.get_all_start_methods() else "spawn"
+            self.pool = mp.get_context(metodo).Pool(self.procesos)
+        if n > self.capacidad:
+            self._liberar_memoria()
+            self.shm = shared_memory.SharedMemory(create=True, size=24 * n)
+            self.capacidad = n
+
+    def _liberar_memoria(self):
+        """Cierra y elimina el bloque de memoria compartida actual"""
+        if self.shm is not None:
+            self.shm.close()
+            self.shm.unlink()
+            self.shm = None
+            self.capacidad = 0
+
+    def calcular(self, tipo, X, Y, max_iter, c=None, **opciones):
+        """
+        Iteraciones de tiempo de escape para los puntos X + iY.
+        tipo es "mandelbrot" o "julia" (en cuyo caso se usa c); opciones se
+        pasan al núcleo (rechazo_interior, periodicidad, modulo, dtype). Con modulo=True
+        retorna también |z|² en el escape.
+        El resultado es una vista sobre la memoria compartida, válida hasta la siguiente llamada.
+        """
+        forma = np.shape(X)
+        n = int(np.prod(forma))
+
+        # Para pocos puntos no compensa repartir el trabajo
+        if self.procesos <= 1 or n <= self.puntos_por_tarea:
+            if tipo == "mandelbrot":
+                return iteraciones_mandelbrot(X, Y, max_iter, **opciones)
+            return iteraciones_julia(X, Y, c, max_iter, **opciones)
+
+        self._preparar(n)
+        x, y, salida, modulo = _vistas(self.shm.buf, n)
+        x[:] = np.ravel(X)
+        y[:] = np.ravel(Y)
+
+        # Tareas pequeñas en una cola compartida: reparto dinámico entre procesos
+        tareas = [
+            (self.shm.name, n, inicio, min(inicio + self.puntos_por_tarea, n), tipo, c, max_iter, opciones)
+            for inicio in range(0, n, self.puntos_por_tarea)
+        ]
+        for _ in self.pool.imap_unordered(_calcular_banda, tareas, chunksize=1):
+            pass
+
+        if opciones.get("modulo"):
+            return salida.reshape(forma), modulo.reshape(forma)
+        return salida.reshape(forma)
+
+    def cerrar(self):
+        """Termina los procesos y libera la memoria compartida"""
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        self._liberar_memoria()
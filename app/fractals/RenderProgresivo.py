@@ -0,0 +1,134 @@
+import numpy as np
+
+
+class RenderProgresivo:
+    """
+    Render progresivo de grueso a fino para los fractales de tiempo de escape.
+    Guarda el buffer de iteraciones a resolución completa junto con una máscara
+    de muestras ya calculadas. Cada llamada a refinar() calcula el siguiente
+    nivel (1/8, 1/4, 1/2 y resolución completa) y solo evalúa los puntos de ese
+    nivel que todavía no se conocen, reutilizando las muestras anteriores.
+    Con suave=True también se guarda |z|² en el escape (modulo) para el coloreado
+    continuo; entonces calcular debe retornar (iteraciones, modulo).
+    """
+
+    def __init__(self, calcular, niveles=(8, 4, 2, 1), suave=False):
+        # calcular(X, Y) -> iteraciones con la forma de X
+        self.calcular = calcular
+        self.niveles = niveles
+        self.suave = suave
+        self.xs = None
+        self.ys = None
+        self.iteraciones = None
+        self.modulo = None
+        self.conocido = None
+        self.nivel = None  # índice en niveles del último nivel completado
+        self.clave = None  # parámetros que determinan los valores (max_iter, c...)
+
+    def reiniciar(self, xs, ys, clave=None, dtype=int):
+        """
+        Empieza una vista nueva con las coordenadas xs (columnas) e ys (filas);
+        dtype es el tipo entero del buffer de iteraciones (el más pequeño que admita max_iter).
+        """
+        self.xs = xs
+        self.ys = ys
+        self.clave = clave
+        self.iteraciones = np.zeros((len(ys), len(xs)), dtype=dtype)
+        self.modulo = np.zeros((len(ys), len(xs)), dtype=np.float32) if self.suave else None
+        self.conocido = np.zeros((len(ys), len(xs)), dtype=bool)
+        self.nivel = None
+
+    def completo(self):
+        """True cuando ya se calculó el nivel de resolución completa"""
+        return self.nivel is not None and self.nivel == len(self.niveles) - 1
+
+    def paso_actual(self):
+        """Paso de muestreo del último nivel calculado"""
+        return self.niveles[self.nivel]
+
+    def refinar(self):
+        """Calcula el siguiente nivel, solo en las muestras que aún no se conocen"""
+        if self.completo():
+            return
+        # Buffer ya lleno (por ejemplo desde la cache): directamente a resolución completa
+        if self.conocido.all():
+            self.nivel = len(self.niveles) - 1
+            return
+        siguiente = 0 if self.nivel is None else self.nivel + 1
+        paso = self.niveles[siguiente]
+
+        # Posiciones del nivel (múltiplos del paso) que faltan por calcular
+        filas, columnas = np.nonzero(~self.conocido[::paso, ::paso])
+        if filas.size:
+            self._calcular_en(filas * paso, columnas * paso)
+        self.nivel = siguiente
+
+    def desplazar(self, xs, ys, clave=None):
+        """
+        Reutiliza el buffer completo si la vista nueva es la anterior desplazada un
+        número entero de píxeles (mismo zoom y misma clave): mueve las iteraciones y
+        calcula solo las franjas expuestas. Retorna False si no es un desplazamiento.
+        """
+        if not self.completo() or clave != self.clave:
+            return False
+        if len(xs) != len(self.xs) or len(ys) != len(self.ys):
+            return False
+        dx = _desfase(self.xs, xs)
+        dy = _desfase(self.ys, ys)
+        if dx is None or dy is None:
+            return False
+
+        alto, ancho = self.iteraciones.shape
+        # Región común: origen [fo, co] en el buffer viejo, destino [fd, cd] en el nuevo
+        fo, fd, h = max(dy, 0), max(-dy, 0), alto - abs(dy)
+        co, cd, w = max(dx, 0), max(-dx, 0), ancho - abs(dx)
+        iteraciones = np.zeros_like(self.iteraciones)
+        conocido = np.zeros_like(self.conocido)
+        iteraciones[fd:fd + h, cd:cd + w] = self.iteraciones[fo:fo + h, co:co + w]
+        conocido[fd:fd + h, cd:cd + w] = True
+        if self.suave:
+            modulo = np.zeros_like(self.modulo)
+            modulo[fd:fd + h, cd:cd + w] = self.modulo[fo:fo + h, co:co + w]
+            self.modulo = modulo
+        self.iteraciones, self.conocido = iteraciones, conocido
+        self.xs, self.ys = xs, ys
+
+        # Solo las filas/columnas expuestas por el desplazamiento
+        filas, columnas = np.nonzero(~self.conocido)
+        if filas.size:
+            self._calcular_en(filas, columnas)
+        return True
+
+    def _calcular_en(self, filas, columnas):
+        """Calcula los píxeles (filas, columnas) y los marca como conocidos"""
+        resultado = self.calcular(self.xs[columnas], self.ys[filas])
+        if self.suave:
+            self.iteraciones[filas, columnas], self.modulo[filas, columnas] = resultado
+        else:
+            self.iteraciones[filas, columnas] = resultado
+        self.conocido[filas, columnas] = True
+
+    def muestras(self):
+        """Iteraciones del último nivel calculado (submuestreadas según su paso)"""
+        paso = self.paso_actual()
+        return self.iteraciones[::paso, ::paso]
+
+    def muestras_modulo(self):
+        """|z|² en el escape para las mismas muestras (solo con suave)"""
+        paso = self.paso_actual()
+        return self.modulo[::paso, ::paso]
+
+
+def _desfase(viejas, nuevas):
+    """Píxeles enteros d tales que nuevas[i] == viejas[i + d], o None"""
+    n = len(viejas)
+    if n < 2:
+        return None
+    d = int(round((nuevas[0] - viejas[0]) / (viejas[1] - viejas[0])))
+    if abs(d) >= n:
+        return None
+    if d >= 0:
+        iguales = np.array_equal(viejas[d:], nuevas[:n - d])
+    else:
+        iguales = np.array_equal(viejas[:n + d], nuevas[-d:])
+    return d if iguales else None
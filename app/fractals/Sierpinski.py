@@ -1,9 +1,18 @@
 
-from math import cos, sin, pi
+from math import cos, sin, pi, sqrt
+import numpy as np
+from fractals.Geometria import CacheGeometria, circulo_dentro, circulos_en_vista, transformar
+from fractals.JuegoCaos import JuegoCaos
 
 class Sierpinski:
+    # Por debajo de este lado en píxeles los triángulos se dibujan como nube de puntos
+    LADO_MINIMO = 2
+
     def __init__(self):
-        pass
+        # Triángulos por profundidad en el marco unitario (triángulo de radio 1 centrado en 0)
+        self.geometria = CacheGeometria(self.triangulos_unitarios)
+        # Juego del caos para profundidades con triángulos de menos de un par de píxeles
+        self.caos = None
 
     def triangulo_equilatero(self, cx, cy, r, angulo_inicial):
         vertices_originales = []
@@ -37,3 +46,94 @@ class Sierpinski:
         segmentos+=self.dibujar_triangulo(segmentos[0], profundidad)
         return segmentos
 
+    def triangulos(self, lado, angle, pan_x, pan_y, profundidad):
+        """
+        Triángulos de SierpinskiSegments como un array (N, 3, 2): el exterior y los
+        de la última subdivisión. Se generan una vez por profundidad en el marco
+        unitario y cada llamada solo aplica la transformación de la vista.
+        """
+        return transformar(self.geometria.obtener(profundidad), lado, angle, pan_x, pan_y)
+
+    def triangulos_vista(self, lado, angle, pan_x, pan_y, profundidad, vista, tamano_minimo=1.0):
+        """
+        Triángulos (N, 3, 2) que se ven en vista = (x0, y0, x1, y1), con nivel de
+        detalle por tamaño de píxel: un triángulo de lado menor que tamano_minimo
+        no se subdivide más. Si el triángulo exterior cabe en la vista se usa la
+        geometría cacheada; si no, se subdivide en coordenadas de pantalla
+        descartando en cada nivel los triángulos que no tocan la vista.
+        """
+        if circulo_dentro((pan_x, pan_y), lado, vista):
+            niveles = self.profundidad_visible(lado, profundidad, tamano_minimo)
+            return self.triangulos(lado, angle, pan_x, pan_y, niveles)
+
+        exterior = transformar(self.geometria.obtener(0)[:1], lado, angle, pan_x, pan_y)
+        activos = exterior
+        terminados = [exterior]
+        for nivel in range(profundidad + 1):
+            lados = np.hypot(*(activos[:, 1] - activos[:, 0]).T)
+            # Cada triángulo y sus subdivisiones caben en su círculo circunscrito
+            visibles = circulos_en_vista(activos.mean(axis=1), lados / sqrt(3), vista)
+            activos, lados = activos[visibles], lados[visibles]
+            pequenos = lados < tamano_minimo
+            if nivel == profundidad or pequenos.all():
+                break
+            terminados.append(activos[pequenos])
+            activos = self.subdividir(activos[~pequenos], 1)
+        terminados.append(activos)
+        return np.concatenate(terminados)
+
+    def profundidad_visible(self, lado, profundidad, tamano_minimo=1.0):
+        """Niveles de profundidad cuyos triángulos aún miden tamano_minimo píxeles al subdividirse"""
+        triangulo = lado * sqrt(3)
+        niveles = 0
+        while niveles < profundidad and triangulo >= tamano_minimo:
+            niveles += 1
+            triangulo /= 2
+        return niveles
+
+    def triangulos_unitarios(self, profundidad):
+        """Triángulo exterior de radio 1 y sus subdivisiones, sin redondear a píxeles"""
+        exterior = np.array([[(cos(2 * pi * i / 3), sin(2 * pi * i / 3)) for i in range(3)]])
+        return np.concatenate((exterior, self.subdividir(exterior, profundidad)))
+
+    @staticmethod
+    def subdividir(triangulos, profundidad):
+        """
+        Subdivisión nivel a nivel con NumPy: cada triángulo (N, 3, 2) se reemplaza
+        por sus tres esquinas a la vez, en el mismo orden que dibujar_triangulo.
+        Retorna los 3^profundidad triángulos por cada triángulo de entrada.
+        """
+        for _ in range(profundidad):
+            v0, v1, v2 = triangulos[:, 0], triangulos[:, 1], triangulos[:, 2]
+            p1 = (v0 + v1) / 2
+            p2 = (v1 + v2) / 2
+            p3 = (v2 + v0) / 2
+            hijos = np.stack((np.stack((v0, p1, p3), axis=1),
+                              np.stack((p1, v1, p2), axis=1),
+                              np.stack((p3, p2, v2), axis=1)), axis=1)
+            triangulos = hijos.reshape(-1, 3, 2)
+        return triangulos
+
+    def tamano_triangulo(self, lado, profundidad):
+        """Lado en píxeles de los triángulos de la última subdivisión (lado es el radio exterior)"""
+        return lado * sqrt(3) / 2 ** profundidad
+
+    def usar_nube(self, lado, profundidad, centro=None, vista=None):
+        """
+        True si los triángulos serían demasiado pequeños y conviene la nube de puntos.
+        Con centro y vista, solo si el triángulo entero cabe en la vista: con zoom
+        casi todos los puntos caerían fuera y es mejor subdividir lo visible.
+        """
+        if vista is not None and not circulo_dentro(centro, lado, vista):
+            return False
+        return self.tamano_triangulo(lado, profundidad) < self.LADO_MINIMO
+
+    def nube(self, lado, angle, pan_x, pan_y, ancho, alto):
+        """
+        Superficie (ancho, alto) con la nube de puntos del juego del caos para la vista.
+        Se completa en unos frames mientras la vista no cambie.
+        """
+        if self.caos is None or (self.caos.ancho, self.caos.alto) != (ancho, alto):
+            self.caos = JuegoCaos(ancho, alto)
+        vertices = transformar(self.geometria.obtener(0)[0], lado, angle, pan_x, pan_y)
+        return self.caos.acumular(vertices)
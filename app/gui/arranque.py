@@ -0,0 +1,36 @@
+import sys
+import time
+
+
+class InformeArranque:
+    """
+    Tiempos del arranque al estilo de python -X importtime: cada etapa (imports,
+    ventana, creación de fractales, primer frame) con su tiempo propio y el
+    acumulado desde origen.
+    """
+
+    def __init__(self, origen=None):
+        self.origen = time.perf_counter() if origen is None else origen
+        self.etapas = []
+
+    def medir(self, nombre, inicio=None, fin=None):
+        """
+        Registra la etapa nombre, de inicio (por defecto el final de la etapa
+        anterior) a fin (por defecto ahora), y retorna fin
+        """
+        ahora = time.perf_counter() if fin is None else fin
+        if inicio is None:
+            inicio = self.origen + (self.etapas[-1][2] if self.etapas else 0.0)
+        self.etapas.append((nombre, ahora - inicio, ahora - self.origen))
+        return ahora
+
+    def lineas(self):
+        lineas = ["arranque: propio [ms] | acumulado [ms] | etapa"]
+        for nombre, propio, acumulado in self.etapas:
+            lineas.append(f"arranque: {propio * 1000:11.1f} | {acumulado * 1000:14.1f} | {nombre}")
+        return lineas
+
+    def imprimir(self, archivo=sys.stderr):
+        # A stderr, como -X importtime, para poder combinar ambas salidas
+        for linea in self.lineas():
+            print(linea, file=archivo)
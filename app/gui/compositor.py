@@ -0,0 +1,82 @@
+import pygame
+
+# Clave de una capa que aún no se ha dibujado (distinta de cualquier clave real)
+INVALIDA = object()
+
+
+class Capa:
+    """Superficie retenida de una parte de la ventana y la clave de lo que muestra"""
+
+    def __init__(self, nombre, rect, dibujar, transparente=False):
+        self.nombre = nombre
+        self.rect = pygame.Rect(rect)
+        # dibujar(superficie): pinta la capa completa en su propia superficie
+        self.dibujar = dibujar
+        self.transparente = transparente
+        flags = pygame.SRCALPHA if transparente else 0
+        self.superficie = pygame.Surface(self.rect.size, flags)
+        self.clave = INVALIDA
+        self.dibujos = 0
+
+    def redibujar(self):
+        self.superficie.fill((0, 0, 0, 0) if self.transparente else (0, 0, 0))
+        self.dibujar(self.superficie)
+        self.dibujos += 1
+
+
+class Compositor:
+    """
+    Compositor de modo retenido: la ventana se forma con capas (de abajo arriba)
+    que solo se vuelven a dibujar cuando cambia su clave, es decir, los datos de
+    los que depende lo que muestran. Solo los rectángulos de las capas que han
+    cambiado se recomponen y se envían a la pantalla con pygame.display.update;
+    si nada cambia, un frame no dibuja nada.
+    """
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.capas = []
+        self.frames = 0
+        self.frames_sucios = 0
+
+    def agregar(self, nombre, rect, dibujar, transparente=False):
+        """Añade una capa encima de las anteriores y la retorna"""
+        capa = Capa(nombre, rect, dibujar, transparente)
+        self.capas.append(capa)
+        return capa
+
+    def invalidar(self):
+        """Fuerza a redibujar todas las capas en el siguiente frame"""
+        for capa in self.capas:
+            capa.clave = INVALIDA
+
+    def componer(self, claves):
+        """
+        claves: {nombre de capa: clave actual}. Redibuja las capas cuya clave cambió,
+        recompone sus rectángulos con todas las capas que los tocan y los envía a la
+        pantalla. Retorna la lista de rectángulos actualizados (vacía si nada cambió).
+        """
+        self.frames += 1
+        sucios = []
+        for capa in self.capas:
+            clave = claves.get(capa.nombre)
+            if clave != capa.clave:
+                capa.clave = clave
+                capa.redibujar()
+                sucios.append(capa.rect)
+        if not sucios:
+            return []
+
+        # Una capa de pantalla completa sucia cubre todas las demás
+        pantalla = self.screen.get_rect()
+        if any(rect.contains(pantalla) for rect in sucios):
+            sucios = [pantalla]
+        for rect in sucios:
+            for capa in self.capas:
+                recorte = rect.clip(capa.rect)
+                if recorte.width and recorte.height:
+                    self.screen.blit(capa.superficie, recorte.topleft,
+                                     recorte.move(-capa.rect.x, -capa.rect.y))
+        pygame.display.update(sucios)
+        self.frames_sucios += 1
+        return sucios
@@ -1,216 +1,464 @@
-from datetime import datetime
+import time
+INICIO = time.perf_counter()  # origen del informe de arranque
 import sys
 import os
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import sys
 import pygame
 from pygame.locals import *
+PYGAME_IMPORTADO = time.perf_counter()
 from math import pi
-from fractals.CurvaKoch import CurvaKoch
-from fractals.Sierpinski import Sierpinski
-from fractals.ArbolRecursivo import ArbolRecursivo
-from fractals.Julia import Julia
-from fractals.Mandelbrot import Mandelbrot
+# Los módulos de cada fractal (y los motores de Mandelbrot y Julia) no se importan
+# aquí: el registro los importa la primera vez que se muestran. Tampoco el
+# Rasterizador (NumPy), que se importa en los dibujar_* que lo usan
+from gui.arranque import InformeArranque
+from gui.compositor import Compositor
+from gui.registro import registro
+from gui.textos import cache_texto
 
 
-pygame.init()
 # Configuración de la ventana
 size = (800, 600)
-screen = pygame.display.set_mode(size)
-pygame.display.set_caption("Fractales Interactivos")
-koch = CurvaKoch()
-SierpinskiF = Sierpinski()
-arbol = ArbolRecursivo()
-nameScreen = "Curva de Koch"
 ruta_carpeta = os.path.join(os.path.dirname(__file__),"..", "capturas")
 ruta_carpeta = os.path.abspath(ruta_carpeta)
 boton_rect = pygame.Rect(300, 500, 200, 50)  # x, y, ancho, alto
+hud_rect = pygame.Rect(0, 0, 400, 115)  # zona del texto de información
+# Sin cambios en pantalla el bucle espera eventos como mucho este tiempo
+ESPERA_REPOSO_MS = 500
 
-# Crear instancias de Mandelbrot y Julia
-mandelbrot = Mandelbrot(width=800, height=600)
-julia = Julia(width=800, height=600)
-
-angle = 0
-scale = 100
-pan_x = size[0] // 2
-pan_y = size[1] // 2
 step_angle = pi / 60
 step_zoom = 10
 step_pan = 5
-iter = 1
-resize = False
 BLANCO = (255, 255, 255)
 AZUL = (0, 102, 204)
 AZUL_OSCURO = (0, 76, 153)
 NEGRO = (0, 0, 0)
-mostrar_boton = True
-# Fuente
-fuente = pygame.font.SysFont(None, 36)
-# Leer modo_fractal desde argumentos si se pasa
-if len(sys.argv) > 1:
-    try:
-        modo_fractal = int(sys.argv[1])
-    except Exception:
-        modo_fractal = 1
-else:
-    modo_fractal = 1
-
-def manejar_transformaciones_seguidas():
-    global angle, scale, pan_x, pan_y, step_angle, step_zoom, step_pan, iter, resize
-    keys = pygame.key.get_pressed()
-    if keys[pygame.K_UP]:
-        scale += step_zoom
-    if keys[pygame.K_DOWN]:
-        scale = max(10, scale - step_zoom)  # Mínimo más alto para fractales complejos
-    if keys[pygame.K_LEFT]:
-        angle -= step_angle
-    if keys[pygame.K_RIGHT]:
-        angle += step_angle
-    if keys[pygame.K_w]:
-        pan_y -= step_pan
-    if keys[pygame.K_s]:
-        pan_y += step_pan
-    if keys[pygame.K_a]:
-        pan_x -= step_pan
-    if keys[pygame.K_d]:
-        pan_x += step_pan   
-            
-def manejar_eventos_teclado(event):
-    global iter, modo_fractal, screen , nameScreen
-    if event.key == pygame.K_e:
-        iter = min(10, iter + 1)  # Limitar iteraciones máximas para rendimiento
-    elif event.key == pygame.K_q:
-        iter = max(1, iter - 1)
-    elif event.key == pygame.K_1:
-        modo_fractal = 1
-    elif event.key == pygame.K_2:
-        modo_fractal = 2
-    elif event.key == pygame.K_3:
-        modo_fractal = 3
-    elif event.key == pygame.K_4:
-        modo_fractal = 4
-    elif event.key == pygame.K_5:
-        modo_fractal = 5
-
-def guardar_captura():
-    global nameScreen, ruta_carpeta
-    
-    # Crear la carpeta si no existe
-    if not os.path.exists(ruta_carpeta):
-        os.makedirs(ruta_carpeta)
-        print(f"Carpeta creada: {ruta_carpeta}")
-    
-    nombre_archivo = datetime.now().strftime(nameScreen + "_%Y%m%d_%H%M%S.png")
-    ruta_completa = os.path.join(ruta_carpeta, nombre_archivo)
-    
-    try:
-        pygame.image.save(screen, ruta_completa)
-        print(f"Captura guardada en: {ruta_completa}")
-    except Exception as e:
-        print(f"Error al guardar la captura: {e}")
-        # Como alternativa, guardar en el directorio actual
-        nombre_archivo_alt = datetime.now().strftime(nameScreen + "_%Y%m%d_%H%M%S.png")
+
+
+class VisorFractales:
+    """
+    Escena del visor de fractales. Se puede entrar y salir varias veces en el
+    mismo proceso (el menú la abre con ENTER y ESC vuelve al menú). Los fractales
+    del registro se importan y se crean la primera vez que se muestran; desde
+    entonces ellos, la cache de teselas, el pool de procesos y los hilos de render
+    siguen calientes entre visitas. Cada visita empieza con la vista por defecto.
+    """
+
+    def __init__(self):
+        # Instancias ya creadas, por modo
+        self.fractales = {}
+        # Motores de Mandelbrot y Julia: se crean con el primero de los dos
+        self.render_paralelo = None
+        self.cache_teselas = None
+        self.render_asincrono = None
+
+        self.screen = None
+        self.compositor = None
+        self.modo_fractal = 1
+        self.nameScreen = "Curva de Koch"
+        self.suavizado = False  # antialiasing de Koch, Sierpinski y el árbol
+        self.reiniciar_vista()
+        # Segundos desde la orden de abrir hasta el primer frame, uno por visita
+        self.arranques = []
+        self.inicio = None
+        self.informe = None  # InformeArranque de la visita, si se pidió
+
+    def reiniciar_vista(self):
+        """Vista por defecto"""
+        self.angle = 0
+        self.scale = 100
+        self.pan_x = size[0] // 2
+        self.pan_y = size[1] // 2
+        self.iter = 1
+
+    @property
+    def tipo(self):
+        """TipoFractal del modo actual"""
+        return registro.tipo(self.modo_fractal)
+
+    def fractal(self):
+        """Instancia del fractal del modo actual, importada y creada la primera vez"""
+        fractal = self.fractales.get(self.modo_fractal)
+        if fractal is None:
+            tipo = self.tipo
+            fractal = tipo.crear(self.informe)
+            if tipo.preparar is not None:
+                tipo.preparar(self, fractal)
+                if self.informe is not None:
+                    self.informe.medir(f"preparar {tipo.nombre}")
+            self.fractales[self.modo_fractal] = fractal
+        return fractal
+
+    def preparar_asincrono(self, fractal):
+        """Conecta Mandelbrot o Julia a los motores compartidos, creados con el primero"""
+        if self.render_asincrono is None:
+            from fractals.CacheTeselas import CacheTeselas
+            from fractals.RenderAsincrono import RenderAsincrono
+            from fractals.RenderParalelo import RenderParalelo
+            # Motor multinúcleo compartido por Mandelbrot y Julia
+            self.render_paralelo = RenderParalelo()
+            # Cache de teselas compartida: volver a una vista ya visitada es casi gratis
+            self.cache_teselas = CacheTeselas()
+            # Mandelbrot y Julia se calculan en un hilo aparte: la ventana no se congela
+            self.render_asincrono = RenderAsincrono()
+        fractal.render_paralelo = self.render_paralelo
+        fractal.cache = self.cache_teselas
+
+    def preparar_julia(self, julia):
+        """Como preparar_asincrono, más el precálculo de las c vecinas"""
+        from fractals.PrecalculoJulia import PrecalculoJulia
+        self.preparar_asincrono(julia)
+        # Variaciones de c vecinas calculadas en segundo plano: rotar en Julia es un blit
+        julia.precalculo = PrecalculoJulia(self.cache_teselas)
+        julia.paso_angulo = step_angle
+
+    def entrar(self, modo_fractal=1, inicio=None, informe=None):
+        """
+        Abre la escena en la ventana con el fractal modo_fractal (un modo del
+        registro). inicio es el instante (time.perf_counter) de la orden de abrir,
+        para medir el tiempo hasta el primer frame; informe, un InformeArranque
+        que se completa con las etapas de la visita y se imprime con el primer frame.
+        """
+        self.inicio = time.perf_counter() if inicio is None else inicio
+        self.informe = informe
+        self.modo_fractal = modo_fractal if modo_fractal in registro else registro.modos()[0]
+        self.reiniciar_vista()
+        for modo, fractal in self.fractales.items():
+            if registro.tipo(modo).geometrico:
+                continue
+            if getattr(fractal, "zoom_profundo", False):
+                self.render_asincrono.ejecutar(fractal.desactivar_zoom_profundo)
+            # La última superficie es de otra vista de la visita anterior
+            self.render_asincrono.descartar(fractal)
+
+        self.screen = pygame.display.set_mode(size)
+        pygame.display.set_caption("Fractales Interactivos")
+        if self.informe is not None:
+            self.informe.medir("ventana")
+        # Capas de la ventana: cada una se redibuja solo cuando cambia lo que muestra
+        self.compositor = Compositor(self.screen)
+        self.compositor.agregar("fractal", self.screen.get_rect(), self.dibujar_fractal)
+        self.compositor.agregar("hud", hud_rect, lambda superficie: mostrar_info_fractal(
+            superficie, self.tipo.nombre, self.iter, self.scale, self.angle), transparente=True)
+        self.compositor.agregar("boton", boton_rect, lambda superficie: crear_boton(
+            superficie, superficie.get_rect(), "Captura", AZUL, BLANCO))
+
+    def ejecutar(self):
+        """
+        Bucle de la escena hasta ESC (volver) o cerrar la ventana.
+        Retorna True si se cerró la ventana.
+        """
+        # Mantiene la ventana abierta hasta que la cierres
+        running = True
+        cerrada = False
+        reposo = False
+        clock = pygame.time.Clock()
+        while running:
+            if reposo:
+                # Nada cambió en el último frame: dormir hasta el siguiente evento
+                eventos = [pygame.event.wait(ESPERA_REPOSO_MS)] + pygame.event.get()
+            else:
+                eventos = pygame.event.get()
+            for event in eventos:
+                if event.type == pygame.QUIT:
+                    running = False
+                    cerrada = True
+                elif event.type == pygame.KEYDOWN:
+                    if event.key == pygame.K_ESCAPE:
+                        running = False
+                    else:
+                        self.manejar_eventos_teclado(event)
+                elif event.type == pygame.MOUSEBUTTONDOWN:
+                    if boton_rect.collidepoint(event.pos):
+                        self.guardar_captura()
+
+            self.manejar_transformaciones_seguidas()
+
+            # Solo se redibujan las capas cuyas entradas cambiaron y solo sus
+            # rectángulos se envían a la pantalla
+            actualizados = self.compositor.componer({
+                "fractal": self.clave_fractal(),
+                "hud": (self.modo_fractal, self.iter, int(self.scale), int(self.angle * 180/pi)),
+                "boton": "Captura",
+            })
+            if actualizados and self.inicio is not None and self.fractal_visible():
+                self.arranques.append(time.perf_counter() - self.inicio)
+                self.inicio = None
+                print(f"Primer frame en {self.arranques[-1] * 1000:.0f} ms")
+                if self.informe is not None:
+                    self.informe.medir("primer frame")
+                    self.informe.imprimir()
+                    self.informe = None
+            ocupado = self.render_asincrono is not None and self.render_asincrono.ocupado()
+            reposo = not actualizados and not ocupado
+
+            # 50 FPS mientras algo cambia: el cálculo de Mandelbrot y Julia no bloquea el bucle
+            if not reposo:
+                clock.tick(50)
+        self.salir()
+        return cerrada
+
+    def salir(self):
+        """Al dejar la escena: el hilo de render suelta la vista y queda en reposo"""
+        if self.render_asincrono is not None:
+            self.render_asincrono.salir()
+
+    def cerrar(self):
+        """Detiene los hilos de render y el pool de procesos"""
+        print("Cache de texto:", cache_texto.estadisticas())
+        if self.render_asincrono is not None:
+            self.render_asincrono.cerrar()
+        for fractal in self.fractales.values():
+            if getattr(fractal, "precalculo", None) is not None:
+                fractal.precalculo.cerrar()
+        if self.render_paralelo is not None:
+            self.render_paralelo.cerrar()
+
+    def fractal_visible(self):
+        """True si la capa del fractal ya muestra el fractal y no solo el fondo"""
+        if not self.tipo.geometrico:
+            return self.render_asincrono.superficie(self.fractal()) is not None
+        return True
+
+    def manejar_transformaciones_seguidas(self):
+        keys = pygame.key.get_pressed()
+        if keys[pygame.K_UP]:
+            if self.tipo.geometrico:
+                self.zoom_geometrico(1 + step_zoom / 100)
+            else:
+                self.scale += step_zoom
+        if keys[pygame.K_DOWN]:
+            if self.tipo.geometrico:
+                self.zoom_geometrico(1 / (1 + step_zoom / 100))
+            else:
+                self.scale = max(10, self.scale - step_zoom)  # Mínimo más alto para fractales complejos
+        if keys[pygame.K_LEFT]:
+            self.angle -= step_angle
+        if keys[pygame.K_RIGHT]:
+            self.angle += step_angle
+        if keys[pygame.K_w]:
+            self.pan_y -= step_pan
+        if keys[pygame.K_s]:
+            self.pan_y += step_pan
+        if keys[pygame.K_a]:
+            self.pan_x -= step_pan
+        if keys[pygame.K_d]:
+            self.pan_x += step_pan
+
+    def zoom_geometrico(self, factor):
+        """
+        Zoom multiplicativo alrededor del centro de la ventana (Koch, Sierpinski y árbol):
+        el punto del centro queda fijo, así se puede acercar sin límite a cualquier borde
+        """
+        factor = max(factor, 10 / self.scale)
+        self.scale *= factor
+        self.pan_x = size[0] / 2 + (self.pan_x - size[0] / 2) * factor
+        self.pan_y = size[1] / 2 + (self.pan_y - size[1] / 2) * factor
+
+    def manejar_eventos_teclado(self, event):
+        if event.key == pygame.K_e:
+            self.iter = min(self.tipo.iteraciones_maximas, self.iter + 1)  # Limitar iteraciones para rendimiento
+        elif event.key == pygame.K_q:
+            self.iter = max(1, self.iter - 1)
+        elif pygame.K_1 <= event.key <= pygame.K_9 and event.key - pygame.K_0 in registro:
+            # Tecla numérica: el fractal registrado con ese modo
+            self.modo_fractal = event.key - pygame.K_0
+            self.iter = min(self.iter, self.tipo.iteraciones_maximas)
+        elif event.key == pygame.K_o and self.tipo.geometrico:
+            self.suavizado = not self.suavizado
+        elif not self.tipo.geometrico:
+            # Recolorear sin volver a iterar el fractal; los cambios corren en el hilo de render
+            from fractals.Paletas import NOMBRES as PALETAS
+            fractal = self.fractal()
+            if event.key == pygame.K_p:
+                self.render_asincrono.ejecutar(lambda: fractal.recolorear(
+                    paleta=PALETAS[(PALETAS.index(fractal.paleta) + 1) % len(PALETAS)]))
+            elif event.key == pygame.K_c:
+                self.render_asincrono.ejecutar(lambda: fractal.recolorear(desfase=fractal.desfase_color + 1))
+            elif event.key == pygame.K_o:
+                self.render_asincrono.ejecutar(fractal.alternar_suave)
+            elif event.key == pygame.K_z and hasattr(fractal, "activar_zoom_profundo"):
+                # Zoom profundo por perturbación a partir de la vista actual (Mandelbrot)
+                self.render_asincrono.ejecutar(lambda: alternar_zoom_profundo(fractal))
+
+    def dibujar_asincrono(self, screen, fractal):
+        """Encarga la vista al hilo de render y dibuja la última superficie terminada"""
+        self.render_asincrono.solicitar(fractal, self.scale, self.angle, self.pan_x, self.pan_y, self.iter)
+        superficie = self.render_asincrono.superficie(fractal)
+        if superficie is not None:
+            screen.blit(superficie, (0, 0))
+
+    def clave_asincrona(self, fractal):
+        # Cada nivel terminado por el hilo de render es una superficie nueva
+        return (self.render_asincrono.version(fractal),)
+
+    def guardar_captura(self):
+        from datetime import datetime
+        # Crear la carpeta si no existe
+        if not os.path.exists(ruta_carpeta):
+            os.makedirs(ruta_carpeta)
+            print(f"Carpeta creada: {ruta_carpeta}")
+
+        nombre_archivo = datetime.now().strftime(self.nameScreen + "_%Y%m%d_%H%M%S.png")
+        ruta_completa = os.path.join(ruta_carpeta, nombre_archivo)
+
         try:
-            pygame.image.save(screen, nombre_archivo_alt)
-            print(f"Captura guardada en directorio actual: {nombre_archivo_alt}")
-        except Exception as e2:
-            print(f"Error al guardar en directorio actual: {e2}")
-
-def dibujar_sierpinski(screen, sierpinski, scale, angle, pan_x, pan_y, iter):
-    segmentos = sierpinski.SierpinskiSegments(scale, angle, pan_x, pan_y, iter)
-    for triangulos in segmentos:
-        pygame.draw.polygon(screen, (255, 255, 255), triangulos, 1)
-
-def dibujar_koch(screen, koch, scale, angle, pan_x, pan_y, iter):
-    segmentos = koch.copoVonKoch(scale, angle, pan_x, pan_y, iter)
-    for start, end in segmentos:
-        pygame.draw.line(screen, (255, 255, 255), start, end)
-
-def dibujar_arbol(screen, arbol, scale, angle, pan_x, pan_y, iter):
+            pygame.image.save(self.screen, ruta_completa)
+            print(f"Captura guardada en: {ruta_completa}")
+        except Exception as e:
+            print(f"Error al guardar la captura: {e}")
+            # Como alternativa, guardar en el directorio actual
+            nombre_archivo_alt = datetime.now().strftime(self.nameScreen + "_%Y%m%d_%H%M%S.png")
+            try:
+                pygame.image.save(self.screen, nombre_archivo_alt)
+                print(f"Captura guardada en directorio actual: {nombre_archivo_alt}")
+            except Exception as e2:
+                print(f"Error al guardar en directorio actual: {e2}")
+
+    def dibujar_fractal(self, screen):
+        """Dibuja el fractal del modo actual (capa del fondo)"""
+        tipo = self.tipo
+        self.nameScreen = tipo.captura
+        tipo.dibujar(self, screen, self.fractal())
+
+    def clave_fractal(self):
+        """Todo lo que determina la capa del fractal: si no cambia, no se redibuja"""
+        clave = (self.modo_fractal, self.scale, self.angle, self.pan_x, self.pan_y, self.iter, self.suavizado)
+        tipo = self.tipo
+        if tipo.clave is not None:
+            clave += tipo.clave(self, self.fractal())
+        return clave
+
+
+def alternar_zoom_profundo(mandelbrot):
+    """Entra o sale del zoom profundo de Mandelbrot"""
+    if mandelbrot.zoom_profundo:
+        mandelbrot.desactivar_zoom_profundo()
+    else:
+        mandelbrot.activar_zoom_profundo()
+
+def vista_geometrica(dibujar):
+    """
+    Adapta dibujar(screen, fractal, scale, angle, pan_x, pan_y, iter, suavizado)
+    a la interfaz del registro, con la vista actual del visor
+    """
+    def dibujar_vista(visor, screen, fractal):
+        dibujar(screen, fractal, visor.scale, visor.angle, visor.pan_x, visor.pan_y, visor.iter, visor.suavizado)
+    return dibujar_vista
+
+def clave_sierpinski(visor, sierpinski):
+    # La nube del juego del caos se completa en varios frames
+    return (sierpinski.caos.acumulados,) if sierpinski.caos is not None else ()
+
+
+def dibujar_sierpinski(screen, sierpinski, scale, angle, pan_x, pan_y, iter, suavizado=False):
+    from fractals.Rasterizador import dibujar_triangulos
+    vista = (0, 0, *screen.get_size())
+    if sierpinski.usar_nube(scale, iter, (pan_x, pan_y), vista):
+        # Triángulos más pequeños que un par de píxeles: nube del juego del caos
+        screen.blit(sierpinski.nube(scale, angle, pan_x, pan_y, *screen.get_size()), (0, 0))
+        return
+    # Solo los triángulos visibles, sin subdividir los que ya miden un par de píxeles
+    triangulos = sierpinski.triangulos_vista(scale, angle, pan_x, pan_y, iter, vista, sierpinski.LADO_MINIMO)
+    # Todos los contornos en una llamada
+    dibujar_triangulos(screen, triangulos, (255, 255, 255), suavizado=suavizado)
+
+def dibujar_koch(screen, koch, scale, angle, pan_x, pan_y, iter, suavizado=False):
+    from fractals.Rasterizador import dibujar_polilineas
+    # Tramos visibles del contorno, subdivididos hasta el tamaño de un píxel
+    polilineas = koch.contorno_vista(scale, angle, pan_x, pan_y, iter, (0, 0, *screen.get_size()))
+    dibujar_polilineas(screen, polilineas, (255, 255, 255), suavizado)
+
+def dibujar_arbol(screen, arbol, scale, angle, pan_x, pan_y, iter, suavizado=False):
+    from fractals.Rasterizador import dibujar_segmentos
     # El árbol crece hacia arriba desde el centro inferior
-    segmentos = arbol.generar_arbol(pan_x, pan_y + scale//2, 90 + angle * 180/pi, scale, iter+2)
-    for start, end in segmentos:
-        pygame.draw.line(screen, (0, 255, 0), start, end, 1)
+    segmentos, rangos = arbol.segmentos_vista(pan_x, pan_y + scale / 2, 90 + angle * 180/pi, scale, iter+2,
+                                              (0, 0, *screen.get_size()))
+    for nivel, (inicio, fin) in enumerate(rangos):
+        grosor, color = arbol.estilo_nivel(nivel, len(rangos))
+        # Una llamada por nivel: todas sus ramas comparten grosor y color
+        dibujar_segmentos(screen, segmentos[inicio:fin], color, grosor, suavizado)
 
-def mostrar_info_fractal(screen, modo_fractal, iter, scale, angle):
+def mostrar_info_fractal(screen, nombre, iter, scale, angle):
     """Muestra información del fractal actual en pantalla"""
-    font = pygame.font.SysFont("Arial", 20)
-    nombres = ["", "Copo de Koch", "Triángulo de Sierpinski", "Árbol Recursivo", 
-               "Conjunto de Mandelbrot", "Conjunto de Julia"]
-    
+    font = cache_texto.fuente("Arial", 20)
+
     info_lines = [
-        f"Fractal: {nombres[modo_fractal]}",
+        f"Fractal: {nombre}",
         f"Iteraciones: {iter}",
         f"Escala: {int(scale)}",
         f"Ángulo: {int(angle * 180/pi)}°"
     ]
-    
+
     for i, line in enumerate(info_lines):
-        text = font.render(line, True, (255, 255, 255))
+        text = cache_texto.texto(line, font, (255, 255, 255))
         screen.blit(text, (10, 10 + i * 25))
-import pygame
 
 def crear_boton(screen, rect, texto, color_fondo, color_texto):
     # Dibujar el fondo del botón
     pygame.draw.rect(screen, color_fondo, rect)
-    fuente = pygame.font.SysFont(None, 24)
-    texto_renderizado = fuente.render(texto, True, color_texto)
+    fuente = cache_texto.fuente(None, 24)
+    texto_renderizado = cache_texto.texto(texto, fuente, color_texto)
     texto_rect = texto_renderizado.get_rect(center=rect.center)
     screen.blit(texto_renderizado, texto_rect)
 
+def imprimir_controles():
+    print("Controles:")
+    print("Flechas: Escalar (↑↓) y Rotar (←→)")
+    print("WASD: Mover")
+    print("Q/E: Cambiar iteraciones")
+    print("1-5: Cambiar fractal")
+    print("P/C/O: Paleta, ciclar colores y coloreado suave (Mandelbrot y Julia)")
+    print("O: Antialiasing (Koch, Sierpinski y árbol)")
+    print("Z: Zoom profundo (Mandelbrot)")
+    print("ESC: Volver")
 
-# Mantiene la ventana abierta hasta que la cierres
-running = True
-clock = pygame.time.Clock()
-print("Controles:")
-print("Flechas: Escalar (↑↓) y Rotar (←→)")
-print("WASD: Mover")
-print("Q/E: Cambiar iteraciones")
-print("1-5: Cambiar fractal")
-print("ESC: Salir")
-
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-        elif event.type == pygame.KEYDOWN:
-            if event.key == pygame.K_ESCAPE:
-                running = False
-            else:
-                manejar_eventos_teclado(event)
-        elif event.type == pygame.MOUSEBUTTONDOWN:
-            if boton_rect.collidepoint(event.pos):
-                guardar_captura()
-    
-    manejar_transformaciones_seguidas()
-    screen.fill((0, 0, 0))
-    
-    if modo_fractal == 1:
-        nameScreen = "curva de Koch"
-        dibujar_koch(screen, koch, scale, angle, pan_x, pan_y, iter)
-    elif modo_fractal == 2:
-        nameScreen = "sierpinski"
-        dibujar_sierpinski(screen, SierpinskiF, scale, angle, pan_x, pan_y, iter)
-    elif modo_fractal == 3:
-        nameScreen = "Arbol Recursivo"
-        dibujar_arbol(screen, arbol, scale, angle, pan_x, pan_y, iter)
-    elif modo_fractal == 4:
-        nameScreen = "Mandelbrot"
-        mandelbrot.dibujar(screen, scale, angle, pan_x, pan_y, iter)
-    elif modo_fractal == 5:
-        nameScreen = "Julia"
-        julia.dibujar(screen, scale, angle, pan_x, pan_y, iter)
-    
-    # Mostrar información del fractal
-    mostrar_info_fractal(screen, modo_fractal, iter, scale, angle)
-    crear_boton(screen, boton_rect, "Captura", AZUL, BLANCO)   
-    
-    pygame.display.flip()
-    
-    # Reducir FPS para fractales complejos
-    if modo_fractal in [4, 5]:
-        clock.tick(10)  # 10 FPS para Mandelbrot y Julia
+
+# Fractales del visor. La geometría se recorta a la vista y al tamaño de píxel, así
+# su coste no crece con la profundidad; el de Mandelbrot y Julia sí
+registro.registrar(1, "Copo de Koch", "curva de Koch", "fractals.CurvaKoch:CurvaKoch",
+                   vista_geometrica(dibujar_koch))
+registro.registrar(2, "Triángulo de Sierpinski", "sierpinski", "fractals.Sierpinski:Sierpinski",
+                   vista_geometrica(dibujar_sierpinski), clave=clave_sierpinski)
+registro.registrar(3, "Árbol Recursivo", "Arbol Recursivo", "fractals.ArbolRecursivo:ArbolRecursivo",
+                   vista_geometrica(dibujar_arbol))
+registro.registrar(4, "Conjunto de Mandelbrot", "Mandelbrot", "fractals.Mandelbrot:Mandelbrot",
+                   VisorFractales.dibujar_asincrono, clave=VisorFractales.clave_asincrona,
+                   preparar=VisorFractales.preparar_asincrono, iteraciones_maximas=10, geometrico=False,
+                   argumentos={"width": 800, "height": 600})
+registro.registrar(5, "Conjunto de Julia", "Julia", "fractals.Julia:Julia",
+                   VisorFractales.dibujar_asincrono, clave=VisorFractales.clave_asincrona,
+                   preparar=VisorFractales.preparar_julia, iteraciones_maximas=10, geometrico=False,
+                   argumentos={"width": 800, "height": 600})
+
+
+# Solo el proceso principal abre la ventana: los procesos del render paralelo
+# importan este módulo y no deben ejecutar el bucle
+if __name__ == "__main__":
+    # python gui/controls.py [modo] [--arranque]: con --arranque se imprime (en
+    # stderr) el tiempo de cada etapa hasta el primer frame
+    informe = InformeArranque(INICIO) if "--arranque" in sys.argv else None
+    if informe is not None:
+        informe.medir("import pygame", fin=PYGAME_IMPORTADO)
+        informe.medir("imports del visor")
+    argumentos = [a for a in sys.argv[1:] if a != "--arranque"]
+    # Leer modo_fractal desde argumentos si se pasa
+    if len(argumentos) > 0:
+        try:
+            modo_fractal = int(argumentos[0])
+        except Exception:
+            modo_fractal = 1
     else:
-        clock.tick(50)  # 50 FPS para fractales geométricos
+        modo_fractal = 1
 
-pygame.quit()
\ No newline at end of file
+    # Solo los subsistemas que usa el visor (pygame.init también abre el audio)
+    pygame.display.init()
+    pygame.font.init()
+    if informe is not None:
+        informe.medir("pygame.display.init y font.init")
+    visor = VisorFractales()
+    imprimir_controles()
+    visor.entrar(modo_fractal, INICIO, informe)
+    visor.ejecutar()
+    visor.cerrar()
+    pygame.quit()
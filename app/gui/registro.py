@@ -0,0 +1,66 @@
+import importlib
+import time
+
+
+class TipoFractal:
+    """
+    Un tipo de fractal del visor. ruta es "modulo:Clase" y el módulo (con sus
+    dependencias) solo se importa al crear la primera instancia.
+    Interfaz de render común, funciones que reciben el visor y la instancia:
+    - dibujar(visor, screen, fractal): dibuja la vista actual del visor
+    - clave(visor, fractal): tupla con lo que, además de la vista, cambia el dibujo
+    - preparar(visor, fractal): se llama una vez, al crear la instancia
+    geometrico: zoom multiplicativo y antialiasing con O (Koch, Sierpinski, árbol);
+    si no, el fractal se calcula en el hilo de render (Mandelbrot, Julia).
+    """
+
+    def __init__(self, modo, nombre, captura, ruta, dibujar, clave=None, preparar=None,
+                 iteraciones_maximas=40, geometrico=True, argumentos=None):
+        self.modo = modo
+        self.nombre = nombre  # para el HUD
+        self.captura = captura  # prefijo del archivo de las capturas
+        self.ruta = ruta
+        self.dibujar = dibujar
+        self.clave = clave
+        self.preparar = preparar
+        self.iteraciones_maximas = iteraciones_maximas
+        self.geometrico = geometrico
+        self.argumentos = argumentos or {}
+
+    def crear(self, informe=None):
+        """Importa el módulo del fractal y crea una instancia (midiendo ambos pasos en informe)"""
+        nombre_modulo, nombre_clase = self.ruta.split(":")
+        inicio = time.perf_counter()
+        clase = getattr(importlib.import_module(nombre_modulo), nombre_clase)
+        if informe is not None:
+            inicio = informe.medir(f"import {nombre_modulo}", inicio)
+        fractal = clase(**self.argumentos)
+        if informe is not None:
+            informe.medir(f"crear {nombre_clase}", inicio)
+        return fractal
+
+
+class Registro:
+    """Tipos de fractal por modo (la tecla numérica que los selecciona)"""
+
+    def __init__(self):
+        self.tipos = {}
+
+    def registrar(self, modo, nombre, captura, ruta, dibujar, **opciones):
+        """Añade (o reemplaza) el tipo del modo y lo retorna"""
+        tipo = TipoFractal(modo, nombre, captura, ruta, dibujar, **opciones)
+        self.tipos[modo] = tipo
+        return tipo
+
+    def tipo(self, modo):
+        return self.tipos[modo]
+
+    def modos(self):
+        return sorted(self.tipos)
+
+    def __contains__(self, modo):
+        return modo in self.tipos
+
+
+# Registro compartido: otros módulos pueden añadir fractales antes de abrir el visor
+registro = Registro()
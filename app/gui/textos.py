@@ -0,0 +1,93 @@
+from collections import OrderedDict
+import pygame
+
+
+class CacheTexto:
+    """
+    Recursos de texto compartidos por el menú y el visor. Cada fuente
+    (nombre, tamaño, negrita, cursiva) se busca en la base de fuentes del sistema
+    una sola vez, y las superficies de texto ya renderizadas se reutilizan por
+    (cadena, fuente, color), guardando las max_textos usadas más recientemente.
+    Las superficies son compartidas: se pueden dibujar con blit pero no modificar.
+    """
+
+    def __init__(self, max_textos=256):
+        self.max_textos = max_textos
+        self.fuentes = {}
+        self.textos = OrderedDict()
+        # Contadores
+        self.aciertos_fuente = 0
+        self.fallos_fuente = 0
+        self.aciertos_texto = 0
+        self.fallos_texto = 0
+
+    def fuente(self, nombre, tamano, negrita=False, cursiva=False):
+        """
+        pygame.font.Font del sistema, creada solo la primera vez. nombre puede ser
+        None (fuente por defecto) o varios nombres separados por comas: se usa el
+        primero instalado, como en pygame.font.SysFont.
+        """
+        clave = (nombre, tamano, negrita, cursiva)
+        fuente = self.fuentes.get(clave)
+        if fuente is None:
+            self.fallos_fuente += 1
+            fuente = pygame.font.SysFont(nombre, tamano, bold=negrita, italic=cursiva)
+            self.fuentes[clave] = fuente
+        else:
+            self.aciertos_fuente += 1
+        return fuente
+
+    def texto(self, cadena, fuente, color, antialias=True):
+        """Superficie de cadena en fuente y color, renderizada solo si no está en cache"""
+        return self._obtener(("texto", cadena, fuente, tuple(color), antialias),
+                             lambda: fuente.render(cadena, antialias, color))
+
+    def lineas(self, cadena, fuente, ancho):
+        """Cadena partida por palabras en líneas de como mucho ancho píxeles"""
+        return self._obtener(("lineas", cadena, fuente, ancho),
+                             lambda: _partir(cadena, fuente, ancho))
+
+    def _obtener(self, clave, crear):
+        valor = self.textos.get(clave)
+        if valor is None:
+            self.fallos_texto += 1
+            valor = crear()
+            self.textos[clave] = valor
+            while len(self.textos) > self.max_textos:
+                self.textos.popitem(last=False)
+        else:
+            self.aciertos_texto += 1
+            self.textos.move_to_end(clave)
+        return valor
+
+    def estadisticas(self):
+        """Contadores de aciertos y fallos de fuentes y textos"""
+        return {
+            "fuentes": len(self.fuentes),
+            "aciertos_fuente": self.aciertos_fuente,
+            "fallos_fuente": self.fallos_fuente,
+            "textos": len(self.textos),
+            "aciertos_texto": self.aciertos_texto,
+            "fallos_texto": self.fallos_texto,
+        }
+
+
+def _partir(cadena, fuente, ancho):
+    """Reparte las palabras de cadena en líneas que caben en ancho"""
+    lineas = []
+    actual = []
+    for palabra in cadena.split():
+        prueba = ' '.join(actual + [palabra])
+        if fuente.size(prueba)[0] <= ancho:
+            actual.append(palabra)
+        else:
+            if actual:
+                lineas.append(' '.join(actual))
+            actual = [palabra]
+    if actual:
+        lineas.append(' '.join(actual))
+    return tuple(lineas)
+
+
+# Instancia compartida por todas las pantallas del proceso
+cache_texto = CacheTexto()
@@ -3,6 +3,19 @@ from pygame.locals import *
 
 WIDTH, HEIGHT = 1280, 820
 
+# Disposición del menú
+FRACTAL_COL_X = 80
+Y_OFFSET = 170 + 100
+ICON_SIZE = 38
+ICON_GAP = 24
+LIST_ITEM_HEIGHT = 56
+CONTROLS_RECT = pygame.Rect(WIDTH - 520, Y_OFFSET - 80, 440, 430)
+EXP_RECT = pygame.Rect(80, Y_OFFSET + 5 * (LIST_ITEM_HEIGHT + 8) + 50, WIDTH - 160, 130)
+# Zonas que cambian con la selección: nombres de la lista y texto de la explicación
+LISTA_RECT = pygame.Rect(FRACTAL_COL_X + ICON_SIZE + ICON_GAP, Y_OFFSET,
+                         CONTROLS_RECT.x - 10 - (FRACTAL_COL_X + ICON_SIZE + ICON_GAP), 5 * (LIST_ITEM_HEIGHT + 8))
+EXP_TEXTO_RECT = pygame.Rect(EXP_RECT.x + 24, EXP_RECT.y + 52, EXP_RECT.width - 48, EXP_RECT.height - 60)
+
 CONTROLS = [
     "Controles:",
     "Flechas: Rotar/Escalar (arriba/abajo: zoom, izq/der: rotar)",
@@ -14,59 +27,79 @@ CONTROLS = [
 ]
 
 import sys
-import subprocess
+import time
+from gui.textos import cache_texto
 
 class MenuPrincipal:
-    def draw_gradient(self, color_top, color_bottom):
+    def draw_gradient(self, destino, color_top, color_bottom):
         """Dibuja un fondo con gradiente vertical"""
         for y in range(HEIGHT):
             ratio = y / HEIGHT
             r = int(color_top[0] * (1 - ratio) + color_bottom[0] * ratio)
             g = int(color_top[1] * (1 - ratio) + color_bottom[1] * ratio)
             b = int(color_top[2] * (1 - ratio) + color_bottom[2] * ratio)
-            pygame.draw.line(self.screen, (r, g, b), (0, y), (WIDTH, y))
+            pygame.draw.line(destino, (r, g, b), (0, y), (WIDTH, y))
     
     def __init__(self):
         pygame.init()
         self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
         pygame.display.set_caption("Fractales Interactivos - Menú Principal")
-        self.font = pygame.font.SysFont("Segoe UI", 38, bold=True)
-        self.fractal_font = pygame.font.SysFont("Segoe UI", 32)
-        # Usar una fuente más atractiva para los controles
-        available_fonts = [f.lower() for f in pygame.font.get_fonts()]
-        if "montserrat" in available_fonts:
-            self.control_font = pygame.font.SysFont("Montserrat", 27)
-        elif "arialroundedmtbold" in available_fonts:
-            self.control_font = pygame.font.SysFont("Arial Rounded MT Bold", 27)
-        else:
-            self.control_font = pygame.font.SysFont("Arial", 27)
-        self.title_font = pygame.font.SysFont("Segoe UI", 54, bold=True)
+        # Fuentes de la cache compartida: cada una se busca en el sistema una sola vez
+        self.font = cache_texto.fuente("Segoe UI", 38, negrita=True)
+        self.fractal_font = cache_texto.fuente("Segoe UI", 32)
+        # Usar una fuente más atractiva para los controles (la primera instalada)
+        self.control_font = cache_texto.fuente("Montserrat,Arial Rounded MT Bold,Arial", 27)
+        self.title_font = cache_texto.fuente("Segoe UI", 54, negrita=True)
         self.running = True
         self.fractales = ["Copo de Koch", "Triángulo de Sierpinski", "Árbol Recursivo", 
                          "Conjunto de Mandelbrot", "Conjunto de Julia"]
         self.selected = 0
+        # Fondo, título, iconos y recuadros se pre-renderizan una vez
+        self.fondo = pygame.Surface((WIDTH, HEIGHT))
+        self.dibujar_fondo(self.fondo)
     
     def draw_menu(self):
+        """Dibuja el menú completo a partir del fondo pre-renderizado"""
+        self.screen.blit(self.fondo, (0, 0))
+        self.dibujar_lista(self.screen)
+        self.dibujar_explicacion(self.screen)
+        pygame.display.flip()
+
+    def mostrar(self):
+        """Vuelve a abrir la ventana del menú (al volver del visor) y lo dibuja"""
+        self.screen = pygame.display.set_mode((WIDTH, HEIGHT))
+        pygame.display.set_caption("Fractales Interactivos - Menú Principal")
+        self.draw_menu()
+
+    def actualizar_seleccion(self):
+        """
+        Al cambiar selected solo se redibujan la lista y el texto de explicación:
+        se restaura su zona desde el fondo y se envían esos rectángulos a la pantalla
+        """
+        for rect in (LISTA_RECT, EXP_TEXTO_RECT):
+            self.screen.blit(self.fondo, rect, rect)
+        self.dibujar_lista(self.screen)
+        self.dibujar_explicacion(self.screen)
+        pygame.display.update([LISTA_RECT, EXP_TEXTO_RECT])
+
+    def dibujar_fondo(self, destino):
+        """Todo lo que no depende de la selección: se dibuja una sola vez"""
         # Fondo con gradiente
-        self.draw_gradient((25, 40, 80), (10, 10, 30))
+        self.draw_gradient(destino, (25, 40, 80), (10, 10, 30))
 
         # Título
-        title = self.title_font.render("Fractales Interactivos", True, (255, 255, 255))
-        self.screen.blit(title, (WIDTH//2 - title.get_width()//2, 40))
+        title = cache_texto.texto("Fractales Interactivos", self.title_font, (255, 255, 255))
+        destino.blit(title, (WIDTH//2 - title.get_width()//2, 40))
 
-        fractal_col_x = 80
-        fractal_col_width = 500
-        boton_espaciado = 80
-        espacio_extra = 100
-        y_offset = 170 + espacio_extra
+        fractal_col_x = FRACTAL_COL_X
+        y_offset = Y_OFFSET
 
         # Subtítulo alineado a la izquierda sobre los botones
-        subtitle = self.font.render("Selecciona un fractal:", True, (200, 220, 255))
-        self.screen.blit(subtitle, (fractal_col_x, y_offset - 70))
+        subtitle = cache_texto.texto("Selecciona un fractal:", self.font, (200, 220, 255))
+        destino.blit(subtitle, (fractal_col_x, y_offset - 70))
 
-        icon_size = 38
-        icon_gap = 24
-        list_item_height = 56
+        icon_size = ICON_SIZE
+        list_item_height = LIST_ITEM_HEIGHT
         for i, nombre in enumerate(self.fractales):
             y = y_offset + i * (list_item_height + 8)
             # Ícono a la izquierda
@@ -74,7 +107,7 @@ class MenuPrincipal:
             icon_y = y + list_item_height//2
             if i == 0:
                 # Copo de Koch: círculo azul
-                pygame.draw.circle(self.screen, (80, 160, 255), (icon_x + icon_size//2, icon_y), icon_size//2)
+                pygame.draw.circle(destino, (80, 160, 255), (icon_x + icon_size//2, icon_y), icon_size//2)
             elif i == 1:
                 # Sierpinski: triángulo verde
                 points = [
@@ -82,42 +115,30 @@ class MenuPrincipal:
                     (icon_x, icon_y + icon_size//2),
                     (icon_x + icon_size, icon_y + icon_size//2)
                 ]
-                pygame.draw.polygon(self.screen, (80, 220, 120), points)
+                pygame.draw.polygon(destino, (80, 220, 120), points)
             elif i == 2:
                 # Árbol: rectángulo marrón y círculo verde
                 trunk = pygame.Rect(icon_x + icon_size//2 - 5, icon_y + 6, 10, 18)
-                pygame.draw.rect(self.screen, (120, 80, 40), trunk)
-                pygame.draw.circle(self.screen, (60, 180, 60), (icon_x + icon_size//2, icon_y), icon_size//2 - 6)
+                pygame.draw.rect(destino, (120, 80, 40), trunk)
+                pygame.draw.circle(destino, (60, 180, 60), (icon_x + icon_size//2, icon_y), icon_size//2 - 6)
             elif i == 3:
                 # Mandelbrot: círculo con gradiente (representando el conjunto)
-                pygame.draw.circle(self.screen, (200, 100, 255), (icon_x + icon_size//2, icon_y), icon_size//2)
-                pygame.draw.circle(self.screen, (100, 50, 150), (icon_x + icon_size//2, icon_y), icon_size//3)
+                pygame.draw.circle(destino, (200, 100, 255), (icon_x + icon_size//2, icon_y), icon_size//2)
+                pygame.draw.circle(destino, (100, 50, 150), (icon_x + icon_size//2, icon_y), icon_size//3)
             elif i == 4:
                 # Julia: anillo con colores
-                pygame.draw.circle(self.screen, (255, 150, 100), (icon_x + icon_size//2, icon_y), icon_size//2)
-                pygame.draw.circle(self.screen, (10, 10, 30), (icon_x + icon_size//2, icon_y), icon_size//3)
-
-            # Texto del fractal con colores diferenciados
-            if i == self.selected:
-                color = (60, 180, 255)
-            else:
-                color = (180, 200, 230) if i < 3 else (220, 180, 255)  # Color especial para fractales complejos
-            
-            text = self.fractal_font.render(f"{i+1}. {nombre}", True, color)
-            tx = icon_x + icon_size + icon_gap
-            ty = y + list_item_height//2 - text.get_height()//2
-            self.screen.blit(text, (tx, ty))
+                pygame.draw.circle(destino, (255, 150, 100), (icon_x + icon_size//2, icon_y), icon_size//2)
+                pygame.draw.circle(destino, (10, 10, 30), (icon_x + icon_size//2, icon_y), icon_size//3)
 
         # Controles - ajustar posición para 5 fractales
-        controls_rect = pygame.Rect(WIDTH - 520, y_offset - 80, 440, 430)
-        pygame.draw.rect(self.screen, (35, 60, 120), controls_rect, border_radius=22)
-        pygame.draw.rect(self.screen, (120, 180, 255), controls_rect, 4, border_radius=22)
+        controls_rect = CONTROLS_RECT
+        pygame.draw.rect(destino, (35, 60, 120), controls_rect, border_radius=22)
+        pygame.draw.rect(destino, (120, 180, 255), controls_rect, 4, border_radius=22)
 
         # --- Controles alineados en filas ---
-        key_font = pygame.font.SysFont("Segoe UI", 18, bold=True)
-        arrow_font = pygame.font.SysFont("Segoe UI Symbol", 18, bold=True)
-        available_fonts = [f.lower() for f in pygame.font.get_fonts()]
-        control_text_font = pygame.font.SysFont("Montserrat", 18) if "montserrat" in available_fonts else pygame.font.SysFont("Arial", 18)
+        key_font = cache_texto.fuente("Segoe UI", 18, negrita=True)
+        arrow_font = cache_texto.fuente("Segoe UI Symbol", 18, negrita=True)
+        control_text_font = cache_texto.fuente("Montserrat,Arial", 18)
 
         controles_info = [
             # (icono, tipo, texto)
@@ -132,64 +153,34 @@ class MenuPrincipal:
         ]
         
         # Título 'Controles' dentro del recuadro
-        controles_title = self.font.render("Controles", True, (255, 255, 180))
-        self.screen.blit(controles_title, (controls_rect.x + 30, controls_rect.y + 18))
+        controles_title = cache_texto.texto("Controles", self.font, (255, 255, 180))
+        destino.blit(controles_title, (controls_rect.x + 30, controls_rect.y + 18))
         espacio_titulo = 18
 
         # --- Sección de explicación de fractales ---
-        explicaciones = [
-            "Curva fractal que genera un copo de nieve a partir de subdivisiones recursivas.",
-            "Triángulo subdividido recursivamente, creando un patrón de huecos triangulares.",
-            "Árbol generado por ramas que se bifurcan recursivamente, simulando crecimiento natural.",
-            "Conjunto de números complejos que no escapan bajo iteración z² + c, formando patrones infinitos.",
-            "Conjunto fractal donde cada punto z se itera con z² + c constante, creando formas orgánicas."
-        ]
-        
-        exp_rect = pygame.Rect(80, y_offset + 5 * (list_item_height + 8) + 50, WIDTH - 160, 130)
-        pygame.draw.rect(self.screen, (30, 38, 60), exp_rect, border_radius=18)
-        pygame.draw.rect(self.screen, (120, 180, 255), exp_rect, 3, border_radius=18)
-        exp_title_font = pygame.font.SysFont("Segoe UI", 26, bold=True)
-        exp_text_font = pygame.font.SysFont("Segoe UI", 19)
-        exp_title = exp_title_font.render("¿Qué hace este fractal?", True, (255, 255, 200))
-        self.screen.blit(exp_title, (exp_rect.x + 24, exp_rect.y + 16))
-        
-        # Texto de explicación con wrap para líneas largas
-        exp_text = explicaciones[self.selected]
-        words = exp_text.split()
-        lines = []
-        current_line = []
-        max_width = exp_rect.width - 48
-        
-        for word in words:
-            test_line = ' '.join(current_line + [word])
-            if exp_text_font.size(test_line)[0] <= max_width:
-                current_line.append(word)
-            else:
-                if current_line:
-                    lines.append(' '.join(current_line))
-                current_line = [word]
-        if current_line:
-            lines.append(' '.join(current_line))
+        exp_rect = EXP_RECT
+        pygame.draw.rect(destino, (30, 38, 60), exp_rect, border_radius=18)
+        pygame.draw.rect(destino, (120, 180, 255), exp_rect, 3, border_radius=18)
+        exp_title_font = cache_texto.fuente("Segoe UI", 26, negrita=True)
+        exp_text_font = cache_texto.fuente("Segoe UI", 19)
+        exp_title = cache_texto.texto("¿Qué hace este fractal?", exp_title_font, (255, 255, 200))
+        destino.blit(exp_title, (exp_rect.x + 24, exp_rect.y + 16))
         
-        for i, line in enumerate(lines):
-            exp_text_render = exp_text_font.render(line, True, (220, 230, 255))
-            self.screen.blit(exp_text_render, (exp_rect.x + 24, exp_rect.y + 56 + i * 25))
-
         y = controls_rect.y + 60 + espacio_titulo
         for icono, tipo, texto in controles_info:
             if tipo == "flecha_dual":
                 # Dibuja dos flechas en una sola celda
                 rect = pygame.Rect(controls_rect.x + 30, y, 48, 28)
-                pygame.draw.rect(self.screen, (255, 255, 220), rect, border_radius=6)
-                pygame.draw.rect(self.screen, (180, 180, 80), rect, 2, border_radius=6)
+                pygame.draw.rect(destino, (255, 255, 220), rect, border_radius=6)
+                pygame.draw.rect(destino, (180, 180, 80), rect, 2, border_radius=6)
                 if icono == "↑/↓":
-                    self.screen.blit(arrow_font.render("↑", True, (80, 80, 40)), (rect.x+5, rect.y+1))
-                    self.screen.blit(arrow_font.render("↓", True, (80, 80, 40)), (rect.x+25, rect.y+1))
+                    destino.blit(cache_texto.texto("↑", arrow_font, (80, 80, 40)), (rect.x+5, rect.y+1))
+                    destino.blit(cache_texto.texto("↓", arrow_font, (80, 80, 40)), (rect.x+25, rect.y+1))
                 else:
-                    self.screen.blit(arrow_font.render("←", True, (80, 80, 40)), (rect.x+5, rect.y+1))
-                    self.screen.blit(arrow_font.render("→", True, (80, 80, 40)), (rect.x+25, rect.y+1))
-                txt = control_text_font.render(texto, True, (220, 240, 255))
-                self.screen.blit(txt, (rect.right + 16, rect.y + rect.height//2 - txt.get_height()//2))
+                    destino.blit(cache_texto.texto("←", arrow_font, (80, 80, 40)), (rect.x+5, rect.y+1))
+                    destino.blit(cache_texto.texto("→", arrow_font, (80, 80, 40)), (rect.x+25, rect.y+1))
+                txt = cache_texto.texto(texto, control_text_font, (220, 240, 255))
+                destino.blit(txt, (rect.right + 16, rect.y + rect.height//2 - txt.get_height()//2))
                 y += 40
                 continue
             if tipo == "teclas_wasd":
@@ -200,12 +191,12 @@ class MenuPrincipal:
                     rx = x0 + i*32
                     rect = pygame.Rect(rx, y, 28, 28)
                     rects.append(rect)
-                    pygame.draw.rect(self.screen, (220, 230, 255), rect, border_radius=6)
-                    pygame.draw.rect(self.screen, (80, 120, 200), rect, 2, border_radius=6)
-                    self.screen.blit(key_font.render(letra, True, (40, 60, 120)), (rect.x+6, rect.y+2))
+                    pygame.draw.rect(destino, (220, 230, 255), rect, border_radius=6)
+                    pygame.draw.rect(destino, (80, 120, 200), rect, 2, border_radius=6)
+                    destino.blit(cache_texto.texto(letra, key_font, (40, 60, 120)), (rect.x+6, rect.y+2))
                 last_rect = rects[-1]
-                txt = control_text_font.render(texto, True, (220, 240, 255))
-                self.screen.blit(txt, (last_rect.right + 16, last_rect.y + last_rect.height//2 - txt.get_height()//2))
+                txt = cache_texto.texto(texto, control_text_font, (220, 240, 255))
+                destino.blit(txt, (last_rect.right + 16, last_rect.y + last_rect.height//2 - txt.get_height()//2))
                 y += 40
                 continue
             if tipo == "teclas_numeros":
@@ -216,21 +207,21 @@ class MenuPrincipal:
                     rx = x0 + i*28
                     rect = pygame.Rect(rx, y, 24, 28)
                     rects.append(rect)
-                    pygame.draw.rect(self.screen, (255, 240, 220), rect, border_radius=6)
-                    pygame.draw.rect(self.screen, (200, 120, 80), rect, 2, border_radius=6)
-                    self.screen.blit(key_font.render(numero, True, (120, 60, 40)), (rect.x+4, rect.y+2))
+                    pygame.draw.rect(destino, (255, 240, 220), rect, border_radius=6)
+                    pygame.draw.rect(destino, (200, 120, 80), rect, 2, border_radius=6)
+                    destino.blit(cache_texto.texto(numero, key_font, (120, 60, 40)), (rect.x+4, rect.y+2))
                 last_rect = rects[-1]
-                txt = control_text_font.render(texto, True, (220, 240, 255))
-                self.screen.blit(txt, (last_rect.right + 16, last_rect.y + last_rect.height//2 - txt.get_height()//2))
+                txt = cache_texto.texto(texto, control_text_font, (220, 240, 255))
+                destino.blit(txt, (last_rect.right + 16, last_rect.y + last_rect.height//2 - txt.get_height()//2))
                 y += 40
                 continue
             if tipo == "tecla":
                 rect = pygame.Rect(controls_rect.x + 30, y, 28, 28)
-                pygame.draw.rect(self.screen, (220, 230, 255), rect, border_radius=6)
-                pygame.draw.rect(self.screen, (80, 120, 200), rect, 2, border_radius=6)
-                self.screen.blit(key_font.render(icono, True, (40, 60, 120)), (rect.x+6, rect.y+2))
-                txt = control_text_font.render(texto, True, (220, 240, 255))
-                self.screen.blit(txt, (rect.right + 16, rect.y + rect.height//2 - txt.get_height()//2))
+                pygame.draw.rect(destino, (220, 230, 255), rect, border_radius=6)
+                pygame.draw.rect(destino, (80, 120, 200), rect, 2, border_radius=6)
+                destino.blit(cache_texto.texto(icono, key_font, (40, 60, 120)), (rect.x+6, rect.y+2))
+                txt = cache_texto.texto(texto, control_text_font, (220, 240, 255))
+                destino.blit(txt, (rect.right + 16, rect.y + rect.height//2 - txt.get_height()//2))
                 y += 40
                 continue
             if tipo == "tecla_larga":
@@ -238,20 +229,53 @@ class MenuPrincipal:
                 color = (220, 255, 220) if icono == "ENTER" else (255, 220, 220)
                 border = (80, 180, 80) if icono == "ENTER" else (180, 80, 80)
                 text_color = (40, 80, 40) if icono == "ENTER" else (120, 40, 40)
-                pygame.draw.rect(self.screen, color, rect, border_radius=6)
-                pygame.draw.rect(self.screen, border, rect, 2, border_radius=6)
+                pygame.draw.rect(destino, color, rect, border_radius=6)
+                pygame.draw.rect(destino, border, rect, 2, border_radius=6)
                 if icono == "ENTER":
-                    enter_font = pygame.font.SysFont("Segoe UI", 15, bold=True)
-                    enter_text = enter_font.render("ENTER", True, text_color)
-                    self.screen.blit(enter_text, (rect.x + (rect.width - enter_text.get_width())//2, rect.y + (rect.height - enter_text.get_height())//2))
+                    enter_font = cache_texto.fuente("Segoe UI", 15, negrita=True)
+                    enter_text = cache_texto.texto("ENTER", enter_font, text_color)
+                    destino.blit(enter_text, (rect.x + (rect.width - enter_text.get_width())//2, rect.y + (rect.height - enter_text.get_height())//2))
                 else:
-                    self.screen.blit(key_font.render(icono, True, text_color), (rect.x+8, rect.y+2))
-                txt = control_text_font.render(texto, True, (220, 240, 255))
-                self.screen.blit(txt, (rect.right + 16, rect.y + rect.height//2 - txt.get_height()//2))
+                    destino.blit(cache_texto.texto(icono, key_font, text_color), (rect.x+8, rect.y+2))
+                txt = cache_texto.texto(texto, control_text_font, (220, 240, 255))
+                destino.blit(txt, (rect.right + 16, rect.y + rect.height//2 - txt.get_height()//2))
                 y += 40
                 continue
 
-        pygame.display.flip()
+
+    def dibujar_lista(self, destino):
+        """Nombres de los fractales, con el seleccionado resaltado"""
+        for i, nombre in enumerate(self.fractales):
+            y = Y_OFFSET + i * (LIST_ITEM_HEIGHT + 8)
+            # Texto del fractal con colores diferenciados
+            if i == self.selected:
+                color = (60, 180, 255)
+            else:
+                color = (180, 200, 230) if i < 3 else (220, 180, 255)  # Color especial para fractales complejos
+            
+            text = cache_texto.texto(f"{i+1}. {nombre}", self.fractal_font, color)
+            tx = FRACTAL_COL_X + ICON_SIZE + ICON_GAP
+            ty = y + LIST_ITEM_HEIGHT//2 - text.get_height()//2
+            destino.blit(text, (tx, ty))
+
+    def dibujar_explicacion(self, destino):
+        """Explicación del fractal seleccionado dentro de su recuadro"""
+        explicaciones = [
+            "Curva fractal que genera un copo de nieve a partir de subdivisiones recursivas.",
+            "Triángulo subdividido recursivamente, creando un patrón de huecos triangulares.",
+            "Árbol generado por ramas que se bifurcan recursivamente, simulando crecimiento natural.",
+            "Conjunto de números complejos que no escapan bajo iteración z² + c, formando patrones infinitos.",
+            "Conjunto fractal donde cada punto z se itera con z² + c constante, creando formas orgánicas."
+        ]
+        exp_text_font = cache_texto.fuente("Segoe UI", 19)
+        
+        # Texto de explicación con wrap para líneas largas (partido una vez por texto)
+        exp_text = explicaciones[self.selected]
+        lines = cache_texto.lineas(exp_text, exp_text_font, EXP_RECT.width - 48)
+        
+        for i, line in enumerate(lines):
+            exp_text_render = cache_texto.texto(line, exp_text_font, (220, 230, 255))
+            destino.blit(exp_text_render, (EXP_RECT.x + 24, EXP_RECT.y + 56 + i * 25))
 
     def run(self):
         clock = pygame.time.Clock()
@@ -274,29 +298,42 @@ class MenuPrincipal:
 
 if __name__ == "__main__":
     menu = MenuPrincipal()
-    clock = pygame.time.Clock()
+    menu.draw_menu()
+    visor = None
     while menu.running:
-        menu.draw_menu()
-        for event in pygame.event.get():
-            if event.type == QUIT:
+        # Nada se anima: el menú duerme hasta el siguiente evento
+        event = pygame.event.wait()
+        anterior = menu.selected
+        if event.type == QUIT:
+            menu.running = False
+        elif event.type in (VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            menu.draw_menu()
+        elif event.type == KEYDOWN:
+            if event.key == K_ESCAPE:
                 menu.running = False
-            elif event.type == KEYDOWN:
-                if event.key == K_ESCAPE:
+            elif event.key == K_DOWN:
+                menu.selected = (menu.selected + 1) % len(menu.fractales)
+            elif event.key == K_UP:
+                menu.selected = (menu.selected - 1) % len(menu.fractales)
+            elif event.key == K_RETURN:
+                # Abrir el fractal seleccionado en este mismo proceso: el visor se crea
+                # la primera vez y conserva fractales, caches y procesos entre visitas
+                inicio = time.perf_counter()
+                if visor is None:
+                    from gui.controls import VisorFractales
+                    visor = VisorFractales()
+                visor.entrar(menu.selected + 1, inicio)
+                if visor.ejecutar():
                     menu.running = False
-                elif event.key == K_DOWN:
-                    menu.selected = (menu.selected + 1) % len(menu.fractales)
-                elif event.key == K_UP:
-                    menu.selected = (menu.selected - 1) % len(menu.fractales)
-                elif event.key == K_RETURN:
-                    # Abrir el fractal seleccionado
-                    fractal_num = menu.selected + 1
-                    import os
-                    script_path = os.path.join(os.path.dirname(__file__), "gui", "controls.py")
-                    
-                    subprocess.Popen([sys.executable, script_path, str(fractal_num)])
-                elif event.key in (K_1, K_2, K_3, K_4, K_5):
-                    # Selección rápida por número
-                    num = event.key - K_1
-                    if num < len(menu.fractales):
-                        menu.selected = num
-        clock.tick(60)
\ No newline at end of file
+                else:
+                    menu.mostrar()
+            elif event.key in (K_1, K_2, K_3, K_4, K_5):
+                # Selección rápida por número
+                num = event.key - K_1
+                if num < len(menu.fractales):
+                    menu.selected = num
+        if menu.selected != anterior:
+            menu.actualizar_seleccion()
+    if visor is not None:
+        visor.cerrar()
+    pygame.quit()
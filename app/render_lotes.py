@@ -0,0 +1,430 @@
+"""
+Render por lotes sin ventana: imágenes de cualquier tamaño (16k x 16k y más)
+calculadas por teselas. Cada fila de teselas se escribe en cuanto está lista en
+un PNG por bandas (o en un PNG por tesela), así la memoria depende del tamaño de
+la tesela y del ancho, nunca del alto de la imagen.
+
+Ejemplos:
+    python app/render_lotes.py mandelbrot --ancho 16384 --alto 16384 --salida mandelbrot.png
+    python app/render_lotes.py julia --c -0.8 0.156 --suave --paleta fuego
+    python app/render_lotes.py koch --iteraciones 7 --teselas-dir teselas_koch
+    python app/render_lotes.py mandelbrot --centro -0.743643887037151 0.131825904205330 --radio 1e-13
+
+Si ni float64 distingue los píxeles, Mandelbrot pasa al zoom profundo por
+perturbación (y Julia termina con un error).
+
+Comprobaciones de regresión (teselas sin costuras, zoom profundo):
+    python app/render_lotes.py --comprobar
+
+Con --almacen las iteraciones de Mandelbrot/Julia se guardan además en disco
+(AlmacenIteraciones) y con --desde-almacen se recolorean, recortan o reducen sin
+volver a iterar:
+    python app/render_lotes.py mandelbrot --ancho 16384 --alto 16384 --almacen m16k
+    python app/render_lotes.py --desde-almacen m16k --paleta fuego --miniatura 8
+"""
+import argparse
+import os
+import sys
+import time
+from decimal import Decimal, localcontext
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+import numpy as np
+import pygame
+from fractals.Mandelbrot import Mandelbrot
+from fractals.Julia import Julia
+from fractals.CurvaKoch import CurvaKoch
+from fractals.Sierpinski import Sierpinski
+from fractals.ArbolRecursivo import ArbolRecursivo
+from fractals.RenderParalelo import RenderParalelo
+from fractals.Rasterizador import dibujar_segmentos
+from fractals.EscritorPNG import EscritorPNG
+from fractals.AlmacenIteraciones import AlmacenIteraciones
+from fractals.Perturbacion import iteraciones_perturbacion, orbita_referencia, precision_necesaria
+from fractals.Paletas import NOMBRES as PALETAS, colorear, colorear_suave
+from fractals.EscapeTime import comparar_precision, precision_para
+
+TIEMPO_ESCAPE = ("mandelbrot", "julia")
+GEOMETRICOS = ("koch", "sierpinski", "arbol")
+
+# Tope de max_iter al elegirlo automáticamente en zoom profundo
+MAX_ITER_PROFUNDO = 20000
+
+# Centro y radio (medio ancho) por defecto de cada conjunto
+VISTAS = {
+    "mandelbrot": (-0.5, 0.0, 1.5),
+    "julia": (0.0, 0.0, 2.0),
+}
+
+
+def crear_fractal(args):
+    """Mandelbrot o Julia configurado con la vista pedida (píxeles cuadrados)"""
+    centro_x, centro_y, radio = VISTAS[args.fractal]
+    if args.centro is not None:
+        centro_x, centro_y = (float(v) for v in args.centro)
+    if args.radio is not None:
+        radio = args.radio
+    radio_y = radio * args.alto / args.ancho
+    limites = dict(xmin=centro_x - radio, xmax=centro_x + radio,
+                   ymin=centro_y - radio_y, ymax=centro_y + radio_y, max_iter=args.iteraciones)
+    if args.fractal == "mandelbrot":
+        fractal = Mandelbrot(args.ancho, args.alto, **limites)
+    else:
+        c = complex(*args.c) if args.c is not None else complex(-0.7, 0.27015)
+        fractal = Julia(args.ancho, args.alto, c=c, **limites)
+    # El paso sale del radio: con radios por debajo del épsilon del centro,
+    # xmax - xmin en float64 da 0
+    fractal.range_x, fractal.range_y = 2 * radio, 2 * radio_y
+    if args.paleta is not None:
+        fractal.paleta = args.paleta
+    fractal.suave = args.suave
+    fractal.precision = args.precision
+    return fractal
+
+
+def necesita_perturbacion(fractal):
+    """True si ni complex128 distingue los píxeles de la vista"""
+    _, _, paso, _ = fractal.rejilla()
+    return precision_para(min(paso), fractal.max_iter) is None
+
+
+def activar_perturbacion(fractal, args):
+    """
+    Mandelbrot más allá de float64: órbita de referencia del centro (con todos los
+    dígitos dados en --centro) y deltas en float64 para cada píxel
+    """
+    centro_x, centro_y, radio = VISTAS["mandelbrot"]
+    centro = args.centro or (Decimal(repr(centro_x)), Decimal(repr(centro_y)))
+    radio = args.radio if args.radio is not None else radio
+    fractal.activar_zoom_profundo(str(centro[0]), str(centro[1]), repr(radio))
+    tope = max(fractal.max_iter, MAX_ITER_PROFUNDO) if args.iteraciones_auto else fractal.max_iter
+    orbita = orbita_referencia(fractal.centro_profundo[0], fractal.centro_profundo[1],
+                               tope, precision_necesaria(fractal.radio_profundo))
+    if args.iteraciones_auto:
+        # Sin --iteraciones: las que necesita una muestra de 64 x 64 puntos de la
+        # vista (cuanto más profundo, más tardan en escapar)
+        t = np.linspace(-radio, radio, 64)
+        muestra = iteraciones_perturbacion(orbita, t[None, :] + 1j * t[:, None] * args.alto / args.ancho, tope)
+        escapados = muestra[muestra < tope - 1]
+        if escapados.size:
+            fractal.max_iter = int(min(tope, max(fractal.max_iter, 1.25 * np.percentile(escapados, 99))))
+    # La órbita calculada hasta tope sirve para cualquier max_iter menor
+    fractal.orbita = orbita[:fractal.max_iter + 1]
+
+
+def verificar_precision(fractal, tolerancia=0.01, lado=256):
+    """
+    Compara complex64 con la referencia complex128 en una muestra de lado x lado
+    puntos de la vista. Retorna (fracción distinta, mayor diferencia, dentro de tolerancia).
+    """
+    X, Y = np.meshgrid(np.linspace(fractal.xmin, fractal.xmax, lado),
+                       np.linspace(fractal.ymin, fractal.ymax, lado))
+    c = fractal.c if isinstance(fractal, Julia) else None
+    fraccion, diferencia = comparar_precision(X, Y, fractal.max_iter, c)
+    return fraccion, diferencia, fraccion <= tolerancia
+
+
+def tesela_tiempo_escape(fractal, ancho, alto, almacen=None):
+    """Función que calcula y colorea una tesela con el núcleo del fractal (y la guarda en almacen)"""
+    paso_x = fractal.range_x / (ancho - 1)
+    paso_y = fractal.range_y / (alto - 1)
+    # En zoom profundo las coordenadas son desplazamientos respecto al centro de la órbita
+    xmin, ymin = (-(ancho - 1) / 2 * paso_x, -(alto - 1) / 2 * paso_y) if getattr(fractal, "zoom_profundo", False) \
+        else (fractal.xmin, fractal.ymin)
+
+    def colorear_tesela(f0, f1, c0, c1):
+        X, Y = np.meshgrid(xmin + np.arange(c0, c1) * paso_x,
+                           ymin + np.arange(f0, f1) * paso_y)
+        resultado = fractal.calcular_puntos(X, Y)
+        iteraciones, modulo = resultado if fractal.suave else (resultado, None)
+        if almacen is not None:
+            almacen.escribir(f0, c0, iteraciones, modulo)
+        if fractal.suave:
+            return colorear_suave(iteraciones, modulo, fractal.max_iter, fractal.paleta, fractal.desfase_color)
+        return colorear(iteraciones, fractal.max_iter, fractal.paleta, fractal.desfase_color)
+
+    return colorear_tesela
+
+
+def tesela_almacen(almacen, paleta, fila, columna, paso):
+    """Función que colorea una tesela leyendo el almacén (recorte desde fila/columna, 1 de cada paso)"""
+
+    def colorear_tesela(f0, f1, c0, c1):
+        return almacen.colorear(paleta, 0, fila + f0 * paso, fila + f1 * paso,
+                                columna + c0 * paso, columna + c1 * paso, paso)
+
+    return colorear_tesela
+
+
+def segmentos_geometricos(tipo, ancho, alto, iteraciones):
+    """Segmentos (N, 2, 2) en píxeles de la imagen completa y su color"""
+    cx, cy = ancho / 2, alto / 2
+    lado = 0.45 * min(ancho, alto)
+    if tipo == "koch":
+        return CurvaKoch().koch_vectorizado(lado, 0, cx, cy, iteraciones), (255, 255, 255)
+    if tipo == "sierpinski":
+        triangulos = Sierpinski().triangulos(lado, 0, cx, cy, iteraciones)
+        # Los tres lados de cada triángulo
+        segmentos = np.stack((triangulos, np.roll(triangulos, -1, axis=1)), axis=2)
+        return segmentos.reshape(-1, 2, 2), (255, 255, 255)
+    return ArbolRecursivo().segmentos(cx, alto * 0.95, 90, alto * 0.3, iteraciones + 2), (0, 255, 0)
+
+
+def tesela_geometrica(tipo, ancho, alto, iteraciones):
+    """Función que dibuja en una tesela los segmentos que la tocan"""
+    segmentos, color = segmentos_geometricos(tipo, ancho, alto, iteraciones)
+    # Extremos en píxeles enteros de la imagen: redondeados en coordenadas de cada
+    # tesela caerían en píxeles distintos según la tesela
+    segmentos = np.floor(segmentos)
+    grosor = max(1, round(min(ancho, alto) / 600))
+    minimo = segmentos.min(axis=1) - grosor
+    maximo = segmentos.max(axis=1) + grosor
+
+    def colorear_tesela(f0, f1, c0, c1):
+        superficie = pygame.Surface((c1 - c0, f1 - f0))
+        # Solo los segmentos cuya caja toca la tesela, en coordenadas de la tesela
+        dentro = ((maximo[:, 0] >= c0) & (minimo[:, 0] < c1) &
+                  (maximo[:, 1] >= f0) & (minimo[:, 1] < f1))
+        # Solo muestreo por lotes: pygame.draw.line redondea distinto cada recorte
+        dibujar_segmentos(superficie, segmentos[dentro] - (c0, f0), color, grosor, solo_lotes=True)
+        return pygame.surfarray.array3d(superficie).transpose(1, 0, 2)
+
+    return colorear_tesela
+
+
+def renderizar(colorear_tesela, ancho, alto, lado, salida=None, carpeta=None):
+    """
+    Recorre la imagen por filas de teselas. Cada fila se escribe en el PNG por
+    bandas y se libera antes de calcular la siguiente. Retorna el número de teselas.
+    """
+    escritor = EscritorPNG(salida, ancho, alto) if salida else None
+    teselas = 0
+    try:
+        for f0 in range(0, alto, lado):
+            f1 = min(f0 + lado, alto)
+            banda = np.empty((f1 - f0, ancho, 3), dtype=np.uint8) if escritor else None
+            for c0 in range(0, ancho, lado):
+                c1 = min(c0 + lado, ancho)
+                rgb = colorear_tesela(f0, f1, c0, c1)
+                if banda is not None:
+                    banda[:, c0:c1] = rgb
+                if carpeta:
+                    ruta = os.path.join(carpeta, f"tesela_{f0 // lado:04d}_{c0 // lado:04d}.png")
+                    with EscritorPNG(ruta, c1 - c0, f1 - f0) as tesela:
+                        tesela.escribir(rgb)
+                teselas += 1
+            if escritor:
+                escritor.escribir(banda)
+        if escritor:
+            escritor.cerrar()
+    finally:
+        if escritor:
+            escritor.archivo.close()
+    return teselas
+
+
+def memoria_maxima_mb():
+    """Pico de memoria residente del proceso en MB (None si no se puede medir)"""
+    try:
+        import resource
+    except ImportError:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux lo da en KB, macOS en bytes
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+
+def iteraciones_decimal(cr, ci, max_iter, precision=60):
+    """Iteraciones de Mandelbrot de un punto con decimal (referencia de comprobar())"""
+    with localcontext() as ctx:
+        ctx.prec = precision
+        zr = zi = Decimal(0)
+        for i in range(max_iter):
+            zr, zi = zr * zr - zi * zi + cr, 2 * zr * zi + ci
+            if zr * zr + zi * zi > 4:
+                return i  # misma convención que escape_time: z_{i+1} es el primero fuera
+    return max(max_iter - 1, 0)
+
+
+def por_teselas(colorear_tesela, ancho, alto, lado):
+    """Imagen (alto, ancho, 3) compuesta con teselas de lado píxeles"""
+    rgb = np.empty((alto, ancho, 3), dtype=np.uint8)
+    for f0 in range(0, alto, lado):
+        for c0 in range(0, ancho, lado):
+            f1, c1 = min(f0 + lado, alto), min(c0 + lado, ancho)
+            rgb[f0:f1, c0:c1] = colorear_tesela(f0, f1, c0, c1)
+    return rgb
+
+
+def comprobar():
+    """
+    Comprobaciones de regresión del render por lotes:
+    - teselas: la imagen no depende del tamaño de tesela (sin costuras)
+    - zoom profundo: vistas con radio por debajo del épsilon de float64 pasan a
+      perturbación y sus esquinas coinciden con la iteración directa en decimal
+    Retorna True si todo pasa.
+    """
+    correcto = True
+    ancho, alto = 600, 450
+    for tipo in TIEMPO_ESCAPE + GEOMETRICOS:
+        args = argumentos([tipo, "--ancho", str(ancho), "--alto", str(alto)])
+        if tipo in TIEMPO_ESCAPE:
+            colorear_tesela = tesela_tiempo_escape(crear_fractal(args), ancho, alto)
+        else:
+            colorear_tesela = tesela_geometrica(tipo, ancho, alto, args.iteraciones)
+        entera = por_teselas(colorear_tesela, ancho, alto, max(ancho, alto))
+        distintos = max(int((entera != por_teselas(colorear_tesela, ancho, alto, lado)).any(axis=2).sum())
+                        for lado in (97, 128))
+        correcto &= distintos == 0
+        print(f"teselas {tipo}: {distintos} píxeles distintos de una sola tesela -> "
+              f"{'ok' if distintos == 0 else 'FALLA'}")
+    for centro, radio in ((("-0.743643887037151", "0.131825904205330"), "1e-13"),
+                          (("-0.743643887037151", "0.131825904205330"), "1e-17"),
+                          (("-0.743643887037151", "0.131825904205330"), "1e-30"),
+                          (("-1.25066", "0.02012"), "1e-30")):
+        args = argumentos(["mandelbrot", "--ancho", "64", "--alto", "64",
+                           "--centro", *centro, "--radio", radio])
+        fractal = crear_fractal(args)
+        profundo = necesita_perturbacion(fractal)
+        if profundo:
+            activar_perturbacion(fractal, args)
+        r = float(radio)
+        esquinas = [(-r, -r), (r, -r), (-r, r), (r, r), (0.0, 0.0)]
+        obtenidas = fractal.calcular_puntos(np.array([x for x, _ in esquinas]), np.array([y for _, y in esquinas]))
+        esperadas = [iteraciones_decimal(Decimal(centro[0]) + Decimal(repr(x)), Decimal(centro[1]) + Decimal(repr(y)),
+                                         fractal.max_iter) for x, y in esquinas]
+        ok = profundo and list(obtenidas) == esperadas
+        correcto &= ok
+        print(f"zoom profundo {centro[0]} {centro[1]} radio {radio}: "
+              f"{'perturbación' if profundo else 'float64'}, {fractal.max_iter} iteraciones -> "
+              f"{'ok' if ok else f'FALLA {list(obtenidas)} != {esperadas}'}")
+    return correcto
+
+
+def argumentos(argv=None):
+    parser = argparse.ArgumentParser(description="Render de fractales por teselas, sin ventana")
+    parser.add_argument("fractal", nargs="?", choices=TIEMPO_ESCAPE + GEOMETRICOS)
+    parser.add_argument("--ancho", type=int, default=4096)
+    parser.add_argument("--alto", type=int, default=4096)
+    parser.add_argument("--tesela", type=int, default=256, help="lado de la tesela en píxeles")
+    parser.add_argument("--iteraciones", type=int, default=None,
+                        help="max_iter (Mandelbrot/Julia, por defecto 500) o profundidad (por defecto 6)")
+    # Decimal: en zoom profundo todos los dígitos del centro cuentan
+    parser.add_argument("--centro", type=Decimal, nargs=2, default=None, metavar=("X", "Y"))
+    parser.add_argument("--radio", type=float, default=None, help="medio ancho de la vista")
+    parser.add_argument("--c", type=float, nargs=2, default=None, metavar=("RE", "IM"), help="parámetro de Julia")
+    parser.add_argument("--paleta", choices=PALETAS, default=None)
+    parser.add_argument("--suave", action="store_true", help="coloreado continuo")
+    parser.add_argument("--procesos", type=int, default=None, help="núcleos para Mandelbrot/Julia")
+    parser.add_argument("--precision", choices=("auto", "simple", "doble"), default="auto",
+                        help="complex64 (simple), complex128 (doble) o según el zoom (auto)")
+    parser.add_argument("--verificar", action="store_true",
+                        help="comparar complex64 con complex128 en una muestra de la vista")
+    parser.add_argument("--salida", default=None, help="PNG de salida (por defecto <fractal>.png)")
+    parser.add_argument("--teselas-dir", default=None, help="escribir además un PNG por tesela en esta carpeta")
+    parser.add_argument("--almacen", default=None, help="guardar las iteraciones en este almacén en disco")
+    parser.add_argument("--desde-almacen", default=None, help="recolorear un almacén existente sin iterar")
+    parser.add_argument("--recorte", type=int, nargs=4, default=None, metavar=("F0", "F1", "C0", "C1"),
+                        help="filas y columnas del almacén a exportar")
+    parser.add_argument("--miniatura", type=int, default=1, help="exportar 1 de cada N píxeles del almacén")
+    parser.add_argument("--comprobar", action="store_true", help="ejecutar las comprobaciones de regresión")
+    args = parser.parse_args(argv)
+    if args.desde_almacen or args.comprobar:
+        return args
+    if args.fractal is None:
+        parser.error("indica un fractal o --desde-almacen")
+    if args.almacen and args.fractal not in TIEMPO_ESCAPE:
+        parser.error("--almacen solo sirve para mandelbrot y julia")
+    args.iteraciones_auto = args.iteraciones is None
+    if args.iteraciones is None:
+        args.iteraciones = 500 if args.fractal in TIEMPO_ESCAPE else 6
+    if args.salida is None and args.teselas_dir is None:
+        args.salida = f"{args.fractal}.png"
+    return args
+
+
+def abrir_almacen(args):
+    """Prepara args y la función de teselas para exportar un almacén existente"""
+    almacen = AlmacenIteraciones.abrir(args.desde_almacen)
+    metadatos = almacen.metadatos
+    f0, f1, c0, c1 = args.recorte or (0, metadatos["alto"], 0, metadatos["ancho"])
+    paso = max(1, args.miniatura)
+    args.fractal = metadatos["tipo"]
+    args.alto = len(range(f0, f1, paso))
+    args.ancho = len(range(c0, c1, paso))
+    if args.salida is None and args.teselas_dir is None:
+        args.salida = f"{os.path.basename(almacen.ruta)}.png"
+    paleta = args.paleta or args.fractal
+    return almacen, tesela_almacen(almacen, paleta, f0, c0, paso)
+
+
+def main(argv=None):
+    args = argumentos(argv)
+    if args.comprobar:
+        sys.exit(0 if comprobar() else 1)
+    if args.teselas_dir:
+        os.makedirs(args.teselas_dir, exist_ok=True)
+
+    render_paralelo = None
+    almacen = None
+    if args.desde_almacen:
+        almacen, colorear_tesela = abrir_almacen(args)
+    elif args.fractal in TIEMPO_ESCAPE:
+        fractal = crear_fractal(args)
+        if args.precision != "simple" and necesita_perturbacion(fractal):
+            if args.fractal == "julia":
+                sys.exit(f"Error: radio {fractal.range_x / 2:g} demasiado pequeño para float64 "
+                         "y Julia no tiene zoom profundo por perturbación")
+            activar_perturbacion(fractal, args)
+            print(f"Precisión: perturbación (órbita de referencia con "
+                  f"{precision_necesaria(fractal.radio_profundo)} dígitos, {fractal.max_iter} iteraciones)")
+        else:
+            print(f"Precisión: {np.dtype(fractal.tipo_complejo()).name}")
+            # El camino rápido (complex64) de auto se comprueba siempre contra complex128
+            rapido = args.precision == "auto" and fractal.tipo_complejo() == np.complex64
+            if args.verificar or rapido:
+                fraccion, diferencia, ok = verificar_precision(fractal)
+                print(f"complex64 frente a complex128: {fraccion:.3%} de puntos distintos "
+                      f"(máx. {diferencia} iteraciones) -> {'dentro' if ok else 'fuera'} de tolerancia")
+                if rapido and not ok:
+                    fractal.precision = "doble"
+                    print("Precisión: complex128 (complex64 fuera de tolerancia)")
+        render_paralelo = RenderParalelo(args.procesos)
+        fractal.render_paralelo = render_paralelo
+        if args.almacen:
+            almacen = AlmacenIteraciones.crear(args.almacen, args.fractal, args.ancho, args.alto,
+                                               fractal.max_iter,
+                                               (fractal.xmin, fractal.xmax, fractal.ymin, fractal.ymax),
+                                               fractal.c if args.fractal == "julia" else None,
+                                               fractal.suave)
+        colorear_tesela = tesela_tiempo_escape(fractal, args.ancho, args.alto, almacen)
+    else:
+        colorear_tesela = tesela_geometrica(args.fractal, args.ancho, args.alto, args.iteraciones)
+
+    inicio = time.perf_counter()
+    try:
+        teselas = renderizar(colorear_tesela, args.ancho, args.alto, args.tesela,
+                             args.salida, args.teselas_dir)
+    finally:
+        if render_paralelo is not None:
+            render_paralelo.cerrar()
+        if almacen is not None:
+            almacen.cerrar()
+    segundos = time.perf_counter() - inicio
+
+    megapixeles = args.ancho * args.alto / 1e6
+    print(f"{args.fractal}: {args.ancho}x{args.alto} en {teselas} teselas de {args.tesela}px")
+    print(f"Tiempo: {segundos:.2f} s  ({megapixeles / segundos:.2f} Mpx/s, "
+          f"{teselas / segundos:.1f} teselas/s)")
+    if args.salida:
+        print(f"Salida: {args.salida} ({os.path.getsize(args.salida) / 1e6:.1f} MB)")
+    if args.teselas_dir:
+        print(f"Teselas: {args.teselas_dir}")
+    if args.almacen:
+        print(f"Almacén de iteraciones: {args.almacen}.npy")
+    pico = memoria_maxima_mb()
+    if pico is not None:
+        print(f"Memoria máxima: {pico:.0f} MB")
+
+
+if __name__ == "__main__":
+    main()